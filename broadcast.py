@@ -0,0 +1,231 @@
+"""
+Bulk broadcast engine for the Telegram bot.
+Sends one message to every known chat without tripping Telegram's flood limits.
+"""
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from telegram.constants import MessageLimit
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+from telegram.ext import Application
+from config import config
+from storage import storage, Storage
+try:
+    from web_server import status_tracker
+except ImportError:
+    status_tracker = None
+
+logger = logging.getLogger(__name__)
+
+# BadRequest descriptions that mean the chat itself is gone; any other
+# BadRequest is about the message and would fail for every chat
+CHAT_GONE_ERRORS = ("chat not found", "user is deactivated", "bot was kicked")
+
+def _is_chat_gone(error: BadRequest) -> bool:
+    message = error.message.lower()
+    return any(reason in message for reason in CHAT_GONE_ERRORS)
+
+class Broadcaster:
+    """Streams recipients from storage in chunks and sends to them concurrently.
+
+    Sends are paced to ``rate`` messages per second across all workers and at
+    most ``concurrency`` requests are in flight. Progress is checkpointed after
+    every chunk, so an interrupted broadcast resumes from the last finished
+    chunk (messages of an unfinished chunk may be sent twice). Telegram's
+    flood limits are per bot, so every hosted bot has its own broadcaster.
+    """
+
+    def __init__(self, store: Storage, rate: float = 25, concurrency: int = 10, chunk_size: int = 100):
+        self.store = store
+        self.rate = rate
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.application = None
+        self.bot_id = 0
+        self.loop = None
+        self.state = None
+        self._task = None
+        self._next_slot = 0.0
+        self._started = 0.0
+        self._sent_at_start = 0
+
+    def attach(self, application: Application):
+        """Bind to an initialized bot; must be called from its event loop."""
+        self.application = application
+        self.bot_id = application.bot.id
+        self.loop = asyncio.get_running_loop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, text: str) -> dict:
+        """Start a new broadcast to every active chat."""
+        if self.is_running:
+            raise RuntimeError("A broadcast is already running")
+        if len(text) > MessageLimit.MAX_TEXT_LENGTH:
+            raise ValueError(f"Message is too long ({len(text)} > {MessageLimit.MAX_TEXT_LENGTH} characters)")
+        state = self.store.create_broadcast(text, total=self.store.count_chats(bot_id=self.bot_id),
+                                            bot_id=self.bot_id)
+        logger.info(f"Starting broadcast {state['id']} to {state['total']} chats")
+        self._spawn(state)
+        return self.get_progress()
+
+    async def resume(self) -> Optional[dict]:
+        """Resume the last interrupted broadcast, if any."""
+        if self.is_running:
+            raise RuntimeError("A broadcast is already running")
+        state = self.store.get_unfinished_broadcast(self.bot_id)
+        if not state:
+            return None
+        logger.info(f"Resuming broadcast {state['id']} after chat {state['last_chat_id']}")
+        self._spawn(state)
+        return self.get_progress()
+
+    def cancel(self) -> bool:
+        """Stop the running broadcast; it is marked as cancelled."""
+        if not self.is_running:
+            return False
+        self._task.cancel()
+        return True
+
+    def _spawn(self, state: dict):
+        self.state = state
+        self._started = time.monotonic()
+        self._sent_at_start = state['sent'] + state['failed']
+        self._next_slot = 0.0
+        # Not application.create_task: the bot's shutdown would wait for it to finish
+        self._task = asyncio.create_task(self._run(state), name=f"broadcast-{state['id']}")
+        self._publish()
+
+    async def _run(self, state: dict):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bot = self.application.bot
+        text = state['text']
+        # Set when Telegram refuses the message itself; stops the remaining sends
+        rejected = []
+
+        async def send(chat_id: int):
+            async with semaphore:
+                if rejected:
+                    return
+                try:
+                    delivered = await self._send(bot, chat_id, text)
+                except BadRequest as e:
+                    rejected.append(e)
+                    return
+            # Live counters for the dashboard; the checkpoint is per chunk
+            state['sent' if delivered else 'failed'] += 1
+
+        try:
+            for chunk in self.store.iter_chat_chunks(state['last_chat_id'], self.chunk_size, self.bot_id):
+                await asyncio.gather(*(send(chat_id) for chat_id in chunk))
+                if rejected:
+                    raise rejected[0]
+                state['last_chat_id'] = chunk[-1]
+                self.store.save_broadcast(state)
+                self._publish()
+            state['status'] = 'done'
+        except asyncio.CancelledError:
+            # Cancelled by an admin, or the bot is shutting down
+            state['status'] = 'cancelled' if self.application.running else 'running'
+            raise
+        except Exception as e:
+            logger.error(f"Broadcast {state['id']} failed: {e}")
+            state['status'] = 'failed'
+        finally:
+            # An interrupted broadcast keeps its last chunk checkpoint for resuming
+            if state['status'] != 'running':
+                state['finished_at'] = datetime.now().isoformat()
+                self.store.save_broadcast(state)
+            self._publish()
+            logger.info(f"Broadcast {state['id']} {state['status']}: {state['sent']} sent, {state['failed']} failed")
+
+    async def _pace(self):
+        """Wait for the next send slot so all workers together stay under ``rate``."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _send(self, bot, chat_id: int, text: str) -> bool:
+        """Send to one chat, honouring flood waits; returns True when delivered.
+
+        Raises BadRequest when Telegram rejects the message rather than the chat.
+        """
+        for _ in range(3):
+            await self._pace()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text)
+                return True
+            except RetryAfter as e:
+                # Flood limit hit: push back every worker, not just this one
+                delay = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') else e.retry_after
+                logger.warning(f"Flood limit during broadcast, waiting {delay}s")
+                self._next_slot = max(self._next_slot, time.monotonic() + delay)
+            except (Forbidden, BadRequest) as e:
+                if isinstance(e, BadRequest) and not _is_chat_gone(e):
+                    raise
+                # Bot blocked, chat deleted or not found - don't try this chat again
+                logger.info(f"Deactivating chat {chat_id}: {e}")
+                self.store.deactivate_chat(chat_id, self.bot_id)
+                return False
+            except TelegramError as e:
+                logger.warning(f"Failed to send broadcast to {chat_id}: {e}")
+                return False
+        return False
+
+    def get_progress(self) -> Optional[dict]:
+        """Get progress, throughput and ETA of the current or last broadcast."""
+        state = self.state
+        if not state:
+            return None
+        done = state['sent'] + state['failed']
+        elapsed = time.monotonic() - self._started
+        throughput = (done - self._sent_at_start) / elapsed if elapsed > 0 else 0.0
+        remaining = max(state['total'] - done, 0)
+        return {
+            'id': state['id'],
+            'bot': self.application.bot.username if self.application else None,
+            'status': state['status'],
+            'sent': state['sent'],
+            'failed': state['failed'],
+            'total': state['total'],
+            'throughput': round(throughput, 2),
+            'eta_seconds': round(remaining / throughput) if throughput and state['status'] == 'running' else None
+        }
+
+    def _publish(self):
+        """Push progress to the dashboard."""
+        if status_tracker:
+            status_tracker.update_broadcast(self.get_progress())
+
+def _create_broadcaster() -> Broadcaster:
+    return Broadcaster(
+        storage,
+        rate=config.BROADCAST_RATE,
+        concurrency=config.BROADCAST_CONCURRENCY,
+        chunk_size=config.BROADCAST_CHUNK_SIZE
+    )
+
+# Global broadcaster instance, used by the first (or only) bot
+broadcaster = _create_broadcaster()
+
+# Broadcasters of all hosted bots, by bot id
+broadcasters = {}
+
+def attach_broadcaster(application: Application) -> Broadcaster:
+    """Set up broadcasting for a hosted bot; the first one gets ``broadcaster``."""
+    instance = broadcaster if broadcaster.application is None else _create_broadcaster()
+    instance.attach(application)
+    broadcasters[instance.bot_id] = instance
+    return instance
+
+def get_broadcaster(bot_id: int = None) -> Optional[Broadcaster]:
+    """Get a hosted bot's broadcaster; the first bot's when ``bot_id`` is None."""
+    if bot_id is None:
+        return broadcaster
+    return broadcasters.get(bot_id)
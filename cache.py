@@ -0,0 +1,66 @@
+"""
+In-memory result cache for the Telegram bot.
+Bounded by size (LRU eviction) and by age (per-entry TTL).
+"""
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class TTLCache:
+    """Dictionary-like cache whose entries expire after ``ttl`` seconds.
+
+    When full, the least recently used entry is evicted. Expired entries are
+    dropped lazily when they are read or pushed out by newer ones.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = 300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        """Get a live entry and mark it as recently used."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store ``value``, evicting the least recently used entry if full."""
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self.max_size:
+            self._data.popitem(last=False)
+        self._data[key] = (self.clock() + self.ttl, value)
+
+    def clear(self):
+        """Remove every entry."""
+        self._data.clear()
+
+    def get_stats(self) -> dict:
+        """Get size and hit ratio of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+        }
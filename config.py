@@ -15,10 +15,55 @@ class Config:
     def __init__(self):
         # Try to load token from file first, then environment variable
         self.BOT_TOKEN: str = self._load_token_from_file() or os.getenv("BOT_TOKEN", "")
+        # Multi-bot hosting: every token is served by this process (the first is the primary bot)
+        self.BOT_TOKENS: list = self._load_tokens()
+        if not self.BOT_TOKEN and self.BOT_TOKENS:
+            self.BOT_TOKEN = self.BOT_TOKENS[0]
         self.LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+        # Language for users whose Telegram language has no catalog in locales/
+        self.DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "es")
         self.WEBHOOK_URL: Optional[str] = os.getenv("WEBHOOK_URL")
         # Web server configuration - compatible with Render
         self.PORT: int = int(os.getenv("PORT", os.getenv("WEB_PORT", "5000")))
+        # Handler middleware chain, outermost first; drop a name to switch it off
+        self.MIDDLEWARES: list = [name.strip() for name in
+                                  os.getenv("MIDDLEWARES", "errors,throttle,debounce,stats,chats,logging,timing").split(",")
+                                  if name.strip()]
+        self.MIDDLEWARE_PROFILE: bool = os.getenv("MIDDLEWARE_PROFILE", "false").lower() in ("1", "true", "yes")
+        # Inbound throttling - quotas are written as "<count>/<seconds>"
+        self.THROTTLE_USER_RATE: str = os.getenv("THROTTLE_USER_RATE", "20/60")
+        self.THROTTLE_CHAT_RATE: str = os.getenv("THROTTLE_CHAT_RATE", "60/60")
+        self.THROTTLE_COMMAND_RATES: str = os.getenv("THROTTLE_COMMAND_RATES", "echo=5/30")
+        self.THROTTLE_MAX_KEYS: int = int(os.getenv("THROTTLE_MAX_KEYS", "10000"))
+        # Inline mode: server-side result cache, Telegram cache_time hint, keystroke debounce
+        self.INLINE_CACHE_SIZE: int = int(os.getenv("INLINE_CACHE_SIZE", "1000"))
+        self.INLINE_CACHE_TTL: float = float(os.getenv("INLINE_CACHE_TTL", "300"))
+        self.INLINE_CACHE_TIME: int = int(os.getenv("INLINE_CACHE_TIME", "300"))
+        self.INLINE_DEBOUNCE: float = float(os.getenv("INLINE_DEBOUNCE", "0.3"))
+        # Media processing: worker processes, parallel jobs and memory limits (bytes)
+        self.MEDIA_WORKERS: int = int(os.getenv("MEDIA_WORKERS", "2"))
+        self.MEDIA_MAX_JOBS: int = int(os.getenv("MEDIA_MAX_JOBS", "4"))
+        self.MEDIA_MAX_BYTES: int = int(os.getenv("MEDIA_MAX_BYTES", str(20 * 1024 * 1024)))
+        self.MEDIA_SPOOL_BYTES: int = int(os.getenv("MEDIA_SPOOL_BYTES", str(1024 * 1024)))
+        self.MEDIA_CACHE_SIZE: int = int(os.getenv("MEDIA_CACHE_SIZE", "500"))
+        self.MEDIA_CACHE_TTL: float = float(os.getenv("MEDIA_CACHE_TTL", "86400"))
+        # Local database for known chats and broadcast checkpoints
+        self.DATABASE_PATH: str = os.getenv("DATABASE_PATH", "bot_data.db")
+        # Telegram user ids allowed to use admin commands such as /broadcast
+        self.ADMIN_IDS: set = {int(user_id) for user_id in os.getenv("ADMIN_IDS", "").split(",") if user_id.strip()}
+        # Broadcasts: messages per second, parallel requests, chats per checkpoint
+        self.BROADCAST_RATE: float = float(os.getenv("BROADCAST_RATE", "25"))
+        self.BROADCAST_CONCURRENCY: int = int(os.getenv("BROADCAST_CONCURRENCY", "10"))
+        self.BROADCAST_CHUNK_SIZE: int = int(os.getenv("BROADCAST_CHUNK_SIZE", "100"))
+        # Key for POST /api/broadcast; the endpoint is disabled when empty
+        self.BROADCAST_API_KEY: str = os.getenv("BROADCAST_API_KEY", "")
+        # Scheduled jobs: seconds a worker holds a running job, seconds between store checks
+        self.SCHEDULER_LEASE: float = float(os.getenv("SCHEDULER_LEASE", "300"))
+        self.SCHEDULER_POLL: float = float(os.getenv("SCHEDULER_POLL", "30"))
+        # Name of this process among workers sharing the database (default: host:pid)
+        self.WORKER_ID: str = os.getenv("WORKER_ID", "")
+        # Record incoming updates to this gzip JSONL file for replay.py (empty = off)
+        self.RECORD_UPDATES: str = os.getenv("RECORD_UPDATES", "")
     
     def _load_token_from_file(self) -> str:
         """Load bot token from token.txt file if it exists."""
@@ -31,10 +76,22 @@ class Config:
         except Exception:
             pass
         return ""
+    
+    def _load_tokens(self) -> list:
+        """Load bot tokens from BOT_TOKENS (comma-separated) or tokens.txt (one per line)."""
+        tokens = [token.strip() for token in os.getenv("BOT_TOKENS", "").split(",")]
+        if not any(tokens) and os.path.exists("tokens.txt"):
+            with open("tokens.txt", "r", encoding="utf-8") as f:
+                tokens = [line.strip() for line in f if not line.lstrip().startswith("#")]
+        tokens = [token for token in tokens if token]
+        if not tokens and self.BOT_TOKEN:
+            tokens = [self.BOT_TOKEN]
+        # Drop duplicates, keeping order
+        return list(dict.fromkeys(tokens))
         
     def validate(self) -> bool:
         """Validate that required configuration is present."""
-        if not self.BOT_TOKEN:
+        if not self.BOT_TOKENS:
             return False
         return True
     
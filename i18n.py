@@ -0,0 +1,122 @@
+"""
+Localized response catalogs for the Telegram bot.
+Loads the JSON catalogs in locales/ once at startup and compiles them into
+indexed tables, so answering in any language is a few lookups per update.
+"""
+import os
+import re
+import json
+import logging
+from typing import Callable, Optional, Union
+from config import config
+
+logger = logging.getLogger(__name__)
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+
+# A compiled message: plain text, a bound str.format for templates with
+# placeholders, or a tuple of those for messages with several variants
+Template = Union[str, Callable, tuple]
+
+def _compile_template(source: Union[str, list]) -> Template:
+    if isinstance(source, list):
+        return tuple(_compile_template(variant) for variant in source)
+    return source.format if '{' in source else source
+
+def _compile_matcher(intent: dict) -> Callable:
+    """Turn an intent's keywords (or suffix) into one precompiled test."""
+    if 'suffix' in intent:
+        suffix = intent['suffix']
+        return lambda text: text.endswith(suffix)
+    # Longest first, so a phrase wins over a keyword it contains
+    keywords = sorted(intent['keywords'], key=len, reverse=True)
+    return re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords)).search
+
+class Catalog:
+    """Compiled message catalogs for every supported language.
+
+    Message keys map to integer ids shared by all languages, and each
+    language is a tuple of templates indexed by those ids; a key missing
+    from a language falls back to the default language's text. Intents
+    become a tuple of ``(matcher, message id)`` per language, checked in
+    catalog order, and templates without placeholders are stored as
+    ready-made strings.
+    """
+
+    def __init__(self, catalogs: dict, default_language: str = "es"):
+        if default_language not in catalogs:
+            raise ValueError(f"No catalog for default language '{default_language}'")
+        self.default_language = default_language
+        self.languages = tuple(catalogs)
+
+        keys = sorted({key for source in catalogs.values() for key in source['messages']})
+        self.ids = {key: index for index, key in enumerate(keys)}
+        default_messages = catalogs[default_language]['messages']
+
+        self.tables = {}
+        self.intents = {}
+        self.fallbacks = {}
+        for language, source in catalogs.items():
+            messages = source['messages']
+            self.tables[language] = tuple(
+                _compile_template(messages.get(key, default_messages.get(key, key))) for key in keys
+            )
+            self.intents[language] = tuple(
+                (_compile_matcher(intent), self.ids[intent['reply']]) for intent in source.get('intents', ())
+            )
+            self.fallbacks[language] = self.ids[source['fallback']] if 'fallback' in source else None
+
+        # language_code -> catalog language, filled on first sight of each code
+        self._resolved = {}
+
+    @classmethod
+    def load(cls, directory: str = LOCALES_DIR, default_language: str = "es") -> 'Catalog':
+        """Read every ``<language>.json`` in ``directory``."""
+        catalogs = {}
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith('.json'):
+                with open(os.path.join(directory, file_name), 'r', encoding='utf-8') as f:
+                    catalogs[file_name[:-5]] = json.load(f)
+        catalog = cls(catalogs, default_language)
+        logger.info(f"Loaded {len(catalog.ids)} messages in {len(catalogs)} languages: {', '.join(catalogs)}")
+        return catalog
+
+    def language(self, language_code: Optional[str]) -> str:
+        """Pick the catalog for a Telegram ``language_code`` such as ``es`` or ``pt-br``."""
+        resolved = self._resolved.get(language_code)
+        if resolved is None:
+            base = (language_code or '').lower().replace('_', '-').split('-')[0]
+            resolved = base if base in self.tables else self.default_language
+            self._resolved[language_code] = resolved
+        return resolved
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ids
+
+    def text(self, key: str, language: str, **params) -> str:
+        """Get a message in ``language``, filling in its placeholders."""
+        template = self.tables[language][self.ids[key]]
+        if isinstance(template, tuple):
+            template = template[0]
+        return template(**params) if callable(template) else template
+
+    def reply(self, message: str, user_name: str, language: str) -> str:
+        """Answer a free-text message with the first matching intent's reply."""
+        table = self.tables[language]
+        lowered = message.lower().strip()
+        for matches, message_id in self.intents[language]:
+            if matches(lowered):
+                template = table[message_id]
+                break
+        else:
+            variants = table[self.fallbacks[language]]
+            # Simple hash-based selection for consistency
+            template = variants[hash(message) % len(variants)]
+        return template(name=user_name) if callable(template) else template
+
+# Global catalog, compiled once at startup
+catalog = Catalog.load(default_language=config.DEFAULT_LANGUAGE)
+
+def user_language(user) -> str:
+    """Get the catalog language for a Telegram user (or None)."""
+    return catalog.language(user.language_code if user else None)
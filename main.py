@@ -2,12 +2,19 @@
 Main entry point for the Telegram bot.
 Handles bot initialization, handler registration, and startup.
 """
+import signal
 import logging
 import asyncio
-from telegram.ext import Application
+from telegram import Update
+from telegram.ext import Application, TypeHandler
+from telegram.request import HTTPXRequest
 from config import config
 from plugin_loader import plugin_loader
 from web_server import run_web_server, status_tracker
+from broadcast import attach_broadcaster
+from media import media_processor
+from scheduler import scheduler
+from replay import UpdateRecorder
 
 # Configure logging
 logging.basicConfig(
@@ -16,8 +23,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Writes incoming traffic to disk when RECORD_UPDATES is set
+recorder = UpdateRecorder(config.RECORD_UPDATES) if config.RECORD_UPDATES else None
+
+ALLOWED_UPDATES = ["message", "callback_query", "inline_query"]
+
+class SharedRequest(HTTPXRequest):
+    """One HTTP connection pool for the Bot API calls of every hosted bot.
+
+    Each bot initializes and shuts down its request object; the pool is
+    opened by the first bot and closed by the last one. Long polling keeps
+    a separate connection per bot (the builder's default getUpdates request).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._users = 0
+    
+    async def initialize(self) -> None:
+        self._users += 1
+        if self._users == 1:
+            await super().initialize()
+    
+    async def shutdown(self) -> None:
+        self._users -= 1
+        if self._users == 0:
+            await super().shutdown()
+
+async def on_shutdown() -> None:
+    """Release resources shared by plugins when the bots stop."""
+    await scheduler.stop()
+    await media_processor.shutdown()
+    if recorder:
+        recorder.close()
+
+def build_application(token: str, request: HTTPXRequest) -> Application:
+    """Create one bot's Application with all plugins registered."""
+    application = Application.builder().token(token).request(request).build()
+    
+    # Record every update before any plugin sees it
+    if recorder:
+        application.add_handler(TypeHandler(Update, recorder.record), group=-100)
+    
+    # Plugin modules are imported once and shared by every bot
+    plugin_loader.load_all_plugins(application)
+    return application
+
+async def wait_for_stop_signal() -> None:
+    """Block until Ctrl+C or SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on this platform; KeyboardInterrupt still stops us
+            pass
+    await stop.wait()
+
+async def run_bots(tokens: list) -> None:
+    """Run every bot on this event loop until a stop signal arrives."""
+    applications = []
+    try:
+        # All bots share this event loop, one HTTP pool and the plugin modules
+        request = SharedRequest(connection_pool_size=max(256, 64 * len(tokens)))
+        applications = [build_application(token, request) for token in tokens]
+        
+        loaded_plugins = plugin_loader.get_loaded_plugins()
+        logger.info(f"Successfully loaded {len(loaded_plugins)} plugins: {list(loaded_plugins.keys())}")
+        
+        for application in applications:
+            await application.initialize()
+            status_tracker.register_bot(application.bot.username)
+            # Broadcasts (from /broadcast or the web API) run on this event loop
+            attach_broadcaster(application)
+            scheduler.add_bot(application.bot)
+        
+        primary = applications[0]
+        
+        # Start running scheduled jobs (persisted ones included)
+        scheduler.start(primary)
+        
+        # Mark bot as started for status tracking
+        status_tracker.bot_started()
+        
+        use_webhook = bool(config.WEBHOOK_URL) and len(applications) == 1
+        if config.WEBHOOK_URL and not use_webhook:
+            logger.warning("WEBHOOK_URL serves a single bot; using polling for all bots")
+        
+        for application in applications:
+            await application.start()
+            if use_webhook:
+                logger.info(f"Starting @{application.bot.username} with webhook: {config.WEBHOOK_URL}")
+                await application.updater.start_webhook(
+                    listen="0.0.0.0",
+                    port=config.PORT,
+                    url_path="webhook",
+                    webhook_url=f"{config.WEBHOOK_URL}/webhook",
+                    allowed_updates=ALLOWED_UPDATES
+                )
+            else:
+                logger.info(f"Starting @{application.bot.username} with polling...")
+                await application.updater.start_polling(allowed_updates=ALLOWED_UPDATES)
+        
+        await wait_for_stop_signal()
+        logger.info("Stopping bots...")
+    finally:
+        for application in applications:
+            if application.updater and application.updater.running:
+                await application.updater.stop()
+            if application.running:
+                await application.stop()
+            await application.shutdown()
+        await on_shutdown()
+        status_tracker.bot_stopped()
+
 async def main():
-    """Main function to start the Telegram bot and web server."""
+    """Main function to start the Telegram bots and web server."""
     
     # Start web server first (always, regardless of bot token)
     logger.info("Starting web dashboard on port 5000...")
@@ -36,43 +158,11 @@ async def main():
             logger.info("Application stopped by user")
         return
     
-    logger.info("Starting Telegram bot...")
+    logger.info(f"Starting {len(config.BOT_TOKENS)} Telegram bot(s)...")
     
     try:
-        # Create the Application
-        application = Application.builder().token(config.BOT_TOKEN).build()
-        
-        # Load all plugins automatically
-        plugin_loader.load_all_plugins(application)
-        
-        loaded_plugins = plugin_loader.get_loaded_plugins()
-        logger.info(f"Successfully loaded {len(loaded_plugins)} plugins: {list(loaded_plugins.keys())}")
-        
-        # Mark bot as started for status tracking
-        status_tracker.bot_started()
-        
-        # Determine if we should use webhook or polling
-        if config.WEBHOOK_URL:
-            logger.info(f"Starting bot with webhook: {config.WEBHOOK_URL}")
-            # Start webhook
-            async with application:
-                await application.start()
-                await application.updater.start_webhook(
-                    listen="0.0.0.0",
-                    port=config.PORT,
-                    url_path="webhook",
-                    webhook_url=f"{config.WEBHOOK_URL}/webhook"
-                )
-                await application.updater.idle()
-        else:
-            logger.info("Starting bot with polling...")
-            # Start polling
-            await application.run_polling(
-                allowed_updates=["message", "callback_query"]
-            )
-            
+        await run_bots(config.BOT_TOKENS)
     except Exception as e:
-        status_tracker.bot_stopped()
         logger.error(f"Failed to start bot: {e}")
         logger.info("Web dashboard is still running at http://localhost:5000")
         # Keep web server running even if bot fails
@@ -130,7 +220,10 @@ if __name__ == "__main__":
         print(f"{BLUE}python main.py{RESET}")
         exit(1)
     
-    print(f"{GREEN}✅ Bot token configurado{RESET}")
+    if len(config.BOT_TOKENS) > 1:
+        print(f"{GREEN}✅ {len(config.BOT_TOKENS)} bots configurados (multi-bot){RESET}")
+    else:
+        print(f"{GREEN}✅ Bot token configurado{RESET}")
     print(f"{BLUE}📊 Nivel de logging: {BOLD}{config.LOG_LEVEL}{RESET}")
     print(f"{MAGENTA}🌐 Dashboard web: {BOLD}http://localhost:5000{RESET}")
     
@@ -0,0 +1,172 @@
+"""
+Async media processing pipeline for the Telegram bot.
+Streams file downloads to spooled temporary storage and runs CPU-heavy work
+in a process pool, so photos, documents and voice notes never stall the event loop.
+"""
+import os
+import asyncio
+import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import httpx
+from config import config
+from cache import TTLCache
+import media_worker
+
+logger = logging.getLogger(__name__)
+
+class MediaTooLarge(Exception):
+    """Raised when a file is bigger than MEDIA_MAX_BYTES."""
+
+class MediaProcessor:
+    """Downloads and analyzes media files with bounded concurrency and memory.
+
+    At most ``max_jobs`` files are handled at once. Each download is kept in
+    memory only up to ``spool_bytes`` and then spills to a temporary file, so
+    memory use stays under roughly ``max_jobs * spool_bytes``. Results are
+    cached by ``file_unique_id``, which stays the same when a file is
+    forwarded or sent again, so repeated files are never processed twice.
+    """
+
+    def __init__(self, workers: int = 2, max_jobs: int = 4, max_bytes: int = 20 * 1024 * 1024,
+                 spool_bytes: int = 1024 * 1024, chunk_bytes: int = 64 * 1024,
+                 cache_size: int = 500, cache_ttl: float = 86400):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.spool_bytes = spool_bytes
+        self.chunk_bytes = chunk_bytes
+        self.results = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self._jobs = asyncio.Semaphore(max_jobs)
+        self._inflight = {}
+        self._pool = None
+        self._client = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use."""
+        if self._pool is None:
+            # spawn: forking a process that runs the web server thread is unsafe.
+            # Each worker re-imports the entry script (main.py and the whole bot),
+            # so starting one takes about as long as starting the bot; the pool
+            # is created once and reused.
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f"Started media process pool with {self.workers} workers")
+        return self._pool
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(30.0))
+        return self._client
+
+    async def shutdown(self):
+        """Close the HTTP client and stop the worker processes."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def process(self, bot, file_id: str, file_unique_id: str, file_size: Optional[int] = None,
+                      thumbnail: bool = False) -> dict:
+        """Get the analysis of a file, downloading and processing it only once."""
+        cached = self.results.get(file_unique_id)
+        if cached is not None:
+            return cached
+
+        # The same file sent twice at once shares one job
+        pending = self._inflight.get(file_unique_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[file_unique_id] = future
+        try:
+            result = await self._run_job(bot, file_id, file_size, thumbnail)
+            self.results.set(file_unique_id, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            del self._inflight[file_unique_id]
+
+    def remember_thumbnail(self, file_unique_id: str, bot_id: int, thumbnail_file_id: str):
+        """Remember the file_id a bot uploaded a cached thumbnail as.
+
+        A file_id only works for the bot that uploaded it, so file_ids are kept
+        per bot and the thumbnail's bytes stay cached for the other bots.
+        """
+        result = self.results.get(file_unique_id)
+        if result is not None:
+            result.setdefault('thumbnail_file_ids', {})[bot_id] = thumbnail_file_id
+
+    async def _run_job(self, bot, file_id: str, file_size: Optional[int], thumbnail: bool) -> dict:
+        if file_size and file_size > self.max_bytes:
+            raise MediaTooLarge(file_size)
+
+        async with self._jobs:
+            telegram_file = await bot.get_file(file_id)
+            data, path = await self._download(telegram_file.file_path)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.pool, media_worker.analyze, data, path, thumbnail)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool next time
+                self._pool = None
+                raise
+            finally:
+                if path:
+                    os.unlink(path)
+
+    async def _download(self, url: str) -> tuple:
+        """Stream a file in chunks; small files stay in memory, big ones spill to disk.
+
+        Returns ``(bytes, None)`` or ``(None, path)``.
+        """
+        buffer = bytearray()
+        spool = None
+        size = 0
+        try:
+            async with self.client.stream('GET', url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(self.chunk_bytes):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise MediaTooLarge(size)
+                    if spool is not None:
+                        spool.write(chunk)
+                        continue
+                    buffer += chunk
+                    if len(buffer) > self.spool_bytes:
+                        spool = tempfile.NamedTemporaryFile(prefix='media-', delete=False)
+                        spool.write(buffer)
+                        buffer = bytearray()
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.unlink(spool.name)
+            raise
+
+        if spool is None:
+            return bytes(buffer), None
+        spool.close()
+        return None, spool.name
+
+# Global media processor instance
+media_processor = MediaProcessor(
+    workers=config.MEDIA_WORKERS,
+    max_jobs=config.MEDIA_MAX_JOBS,
+    max_bytes=config.MEDIA_MAX_BYTES,
+    spool_bytes=config.MEDIA_SPOOL_BYTES,
+    cache_size=config.MEDIA_CACHE_SIZE,
+    cache_ttl=config.MEDIA_CACHE_TTL
+)
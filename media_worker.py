@@ -0,0 +1,120 @@
+"""
+CPU-bound media work, run in a separate process pool.
+Only uses the standard library (Pillow is optional) and no bot state, so jobs
+can be pickled to the workers as plain data.
+"""
+import io
+import struct
+import hashlib
+from typing import BinaryIO, Optional
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CHUNK_SIZE = 64 * 1024
+THUMBNAIL_SIZE = (320, 320)
+
+# Magic bytes -> format name
+SIGNATURES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+    (b'%PDF', 'PDF'),
+    (b'PK\x03\x04', 'ZIP'),
+    (b'OggS', 'OGG'),
+    (b'ID3', 'MP3'),
+)
+
+def sniff_format(header: bytes) -> Optional[str]:
+    """Guess the file format from its first bytes; None when it isn't recognized."""
+    for signature, name in SIGNATURES:
+        if header.startswith(signature):
+            return name
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    if header[4:8] == b'ftyp':
+        return 'MP4'
+    return None
+
+def _jpeg_size(stream: BinaryIO) -> Optional[tuple]:
+    """Read width and height from the first JPEG start-of-frame marker."""
+    stream.seek(2)
+    while True:
+        marker = stream.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = stream.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            data = stream.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        stream.seek(length - 2, io.SEEK_CUR)
+
+def image_size(stream: BinaryIO, file_format: str) -> Optional[tuple]:
+    """Get image dimensions without decoding the image."""
+    stream.seek(0)
+    header = stream.read(32)
+    if file_format == 'PNG' and len(header) >= 24:
+        return struct.unpack('>II', header[16:24])
+    if file_format == 'GIF' and len(header) >= 10:
+        return struct.unpack('<HH', header[6:10])
+    if file_format == 'JPEG':
+        return _jpeg_size(stream)
+    return None
+
+def make_thumbnail(stream: BinaryIO) -> Optional[bytes]:
+    """Render a small JPEG preview; needs Pillow."""
+    if Image is None:
+        return None
+    stream.seek(0)
+    try:
+        with Image.open(stream) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            output = io.BytesIO()
+            image.convert('RGB').save(output, format='JPEG', quality=80)
+            return output.getvalue()
+    except Exception:
+        return None
+
+def analyze(data: Optional[bytes], path: Optional[str], thumbnail: bool = False) -> dict:
+    """Hash, identify and measure a downloaded file.
+
+    The file is passed either in memory (``data``) or as a spooled file on
+    disk (``path``) and is read in chunks, so large files never have to fit
+    in memory here.
+    """
+    stream = io.BytesIO(data) if data is not None else open(path, 'rb')
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        header = stream.read(32)
+        stream.seek(0)
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+
+        file_format = sniff_format(header)
+        result = {
+            'size': size,
+            'format': file_format,
+            'sha256': digest.hexdigest(),
+            'dimensions': None,
+            'thumbnail': None
+        }
+        if file_format in ('JPEG', 'PNG', 'GIF', 'WEBP'):
+            result['dimensions'] = image_size(stream, file_format)
+            if thumbnail:
+                result['thumbnail'] = make_thumbnail(stream)
+        return result
+    finally:
+        stream.close()
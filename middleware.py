@@ -0,0 +1,252 @@
+"""
+Middleware pipeline for plugin handlers.
+Wraps every handler once at registration with the cross-cutting concerns
+(error translation, throttling, statistics, logging, timing) so plugins
+only contain their own logic.
+"""
+import time
+import asyncio
+import logging
+from typing import Callable, NamedTuple, Optional
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import ContextTypes
+from i18n import catalog, user_language
+try:
+    from web_server import status_tracker
+except ImportError:
+    status_tracker = None
+
+logger = logging.getLogger(__name__)
+
+# Catalog key of the reply sent when a handler fails
+DEFAULT_ERROR_REPLY = "error.default"
+
+class HandlerSpec(NamedTuple):
+    """Static description of a registered handler, known at registration time."""
+    name: str
+    kind: str = 'command'  # 'command', 'message', 'media', 'inline' or 'callback'
+    command: Optional[str] = None
+    icon: str = '💬'
+    # Catalog key, or the literal text for plugins without catalog entries
+    error_reply: str = DEFAULT_ERROR_REPLY
+
+# A middleware takes the next handler and the spec, and returns a new handler.
+# Everything it needs per call must be resolved here, not inside the wrapper.
+
+def error_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Turn handler exceptions into a log entry and a friendly reply in the user's language."""
+    error_reply = spec.error_reply
+    localized = error_reply in catalog
+    log_error = status_tracker.log_error if status_tracker else None
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        try:
+            return await handler(update, context)
+        except Exception as e:
+            logger.error(f"Error in {spec.name}: {e}")
+            if log_error:
+                log_error(context.bot.username)
+            message = update.effective_message
+            if message:
+                try:
+                    await message.reply_text(
+                        catalog.text(error_reply, user_language(update.effective_user)) if localized else error_reply
+                    )
+                except Exception as reply_error:
+                    logger.error(f"Failed to send error message to user: {reply_error}")
+
+    return wrapper
+
+def throttle_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Drop over-limit updates before the handler does any work."""
+    if spec.kind == 'inline':
+        # Inline queries arrive once per keystroke; debouncing handles them
+        return handler
+    from throttle import throttler
+    allow = throttler.allow
+    command = spec.command
+    log_dropped = status_tracker.log_dropped if status_tracker else None
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user = update.effective_user
+        chat = update.effective_chat
+        if allow(user.id if user else None, chat.id if chat else None, command, context.bot.id):
+            return await handler(update, context)
+        if log_dropped:
+            log_dropped(context.bot.username)
+        logger.debug(f"Throttled {spec.name} for user {user.id if user else 'unknown'}")
+        if update.callback_query:
+            # Stop the button's loading spinner even though nothing runs
+            try:
+                await update.callback_query.answer()
+            except TelegramError as e:
+                logger.debug(f"Could not answer throttled callback query: {e}")
+
+    return wrapper
+
+def debounce_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Answer only the last of a burst of inline queries from the same user.
+
+    Each query waits ``INLINE_DEBOUNCE`` seconds; if the user typed again in
+    the meantime, the older query is dropped without computing results.
+    The handler must be registered with ``block=False`` so waiting doesn't
+    hold up other updates.
+    """
+    if spec.kind != 'inline':
+        return handler
+    from config import config
+    delay = config.INLINE_DEBOUNCE
+    sleep = asyncio.sleep
+    # user id -> id of the newest pending update; entries live only while waiting
+    latest = {}
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user_id = update.effective_user.id
+        latest[user_id] = update.update_id
+        await sleep(delay)
+        if latest.get(user_id) != update.update_id:
+            return None
+        del latest[user_id]
+        return await handler(update, context)
+
+    return wrapper
+
+def stats_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Count the update as a command or message on the dashboard."""
+    if not status_tracker:
+        return handler
+    log = status_tracker.log_message if spec.kind in ('message', 'media') else status_tracker.log_command
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user = update.effective_user
+        if user:
+            log(user.id, context.bot.username)
+        return await handler(update, context)
+
+    return wrapper
+
+def chats_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Remember every chat that talks to the bot, for broadcasts."""
+    from storage import storage
+    remember_chat = storage.remember_chat
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        chat = update.effective_chat
+        if chat:
+            try:
+                remember_chat(chat.id, chat.type, context.bot.id)
+            except Exception as e:
+                logger.error(f"Failed to store chat {chat.id}: {e}")
+        return await handler(update, context)
+
+    return wrapper
+
+def _message_text(update: Update) -> Optional[str]:
+    message = update.effective_message
+    return message.text if message else None
+
+_TEXT_GETTERS = {
+    'media': lambda update: update.effective_message.caption or "[archivo]",
+    'inline': lambda update: f"@inline {update.inline_query.query}",
+    'callback': lambda update: f"[botón] {update.callback_query.data}"
+}
+
+def logging_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Decorated console output plus a log line for every handled update.
+
+    Handlers may return a short description of their reply to show here.
+    """
+    icon = spec.icon
+    get_text = _TEXT_GETTERS.get(spec.kind, _message_text)
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user = update.effective_user
+        text = get_text(update)
+        print(f"\n{icon} Mensaje recibido: {text}")
+        print(f"👤 Usuario: {user.id if user else 'desconocido'}")
+
+        result = await handler(update, context)
+
+        if result is not None:
+            print(f"🤖 Respuesta: {result}")
+        print("═" * 50)
+        if user:
+            logger.info(f"[{spec.name}] {user.first_name or 'Desconocido'}@{user.username or 'unknown'} ({user.id}): {text} -> {result}")
+        return result
+
+    return wrapper
+
+def timing_middleware(handler: Callable, spec: HandlerSpec) -> Callable:
+    """Record how long the wrapped handler takes."""
+    if not status_tracker:
+        return handler
+    record = status_tracker.log_handler_time
+    name = spec.name
+    perf_counter = time.perf_counter
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        start = perf_counter()
+        try:
+            return await handler(update, context)
+        finally:
+            record(name, perf_counter() - start)
+
+    return wrapper
+
+MIDDLEWARES = {
+    'errors': error_middleware,
+    'throttle': throttle_middleware,
+    'debounce': debounce_middleware,
+    'stats': stats_middleware,
+    'chats': chats_middleware,
+    'logging': logging_middleware,
+    'timing': timing_middleware
+}
+
+# Inclusive time per (handler, layer); filled only when profiling is enabled
+_profile = {}
+
+def _profiled(handler: Callable, handler_name: str, layer: str) -> Callable:
+    """Measure the inclusive time spent in one layer of the chain."""
+    counters = _profile.setdefault(handler_name, {}).setdefault(layer, [0, 0.0])
+    perf_counter = time.perf_counter
+
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        start = perf_counter()
+        try:
+            return await handler(update, context)
+        finally:
+            counters[0] += 1
+            counters[1] += perf_counter() - start
+
+    return wrapper
+
+def build_chain(handler: Callable, spec: HandlerSpec, names: list, profile: bool = False) -> Callable:
+    """Wrap ``handler`` with the named middlewares; the first name is outermost."""
+    unknown = [name for name in names if name not in MIDDLEWARES]
+    if unknown:
+        raise ValueError(f"Unknown middleware: {', '.join(unknown)}")
+
+    wrapped = _profiled(handler, spec.name, 'handler') if profile else handler
+    for name in reversed(names):
+        wrapped = MIDDLEWARES[name](wrapped, spec)
+        if profile:
+            wrapped = _profiled(wrapped, spec.name, name)
+    return wrapped
+
+def get_profile() -> dict:
+    """Average self time (ms) of every middleware layer, per handler."""
+    report = {}
+    for handler_name, layers in _profile.items():
+        names = list(layers)  # registration order: handler first, outermost last
+        per_layer = {}
+        for index, name in enumerate(names):
+            calls, total = layers[name]
+            inner = layers[names[index - 1]][1] if index > 0 else 0.0
+            per_layer[name] = {
+                'calls': calls,
+                'self_ms': round((total - inner) * 1000 / calls, 4) if calls else 0.0
+            }
+        report[handler_name] = per_layer
+    return report
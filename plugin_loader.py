@@ -5,16 +5,33 @@ Automatically loads and registers all plugins from the plugins directory.
 import os
 import importlib
 import logging
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.ext import (Application, CallbackQueryHandler, CommandHandler, InlineQueryHandler,
+                          MessageHandler, filters)
+from config import config
+from middleware import HandlerSpec, DEFAULT_ERROR_REPLY, build_chain
 
 logger = logging.getLogger(__name__)
 
 class PluginLoader:
     """Loads and manages bot plugins."""
     
-    def __init__(self, plugins_dir: str = "plugins"):
+    def __init__(self, plugins_dir: str = "plugins", middlewares: list = None, profile: bool = False):
         self.plugins_dir = plugins_dir
         self.loaded_plugins = {}
+        # Spec of every handler registered by the last load_all_plugins call
+        self.handler_specs = []
+        self.middlewares = list(config.MIDDLEWARES if middlewares is None else middlewares)
+        self.profile = profile
+    
+    def _wrap(self, callback, plugin_module, **spec):
+        """Wrap a plugin callback with the middleware chain (done once, at registration)."""
+        spec = HandlerSpec(
+            name=callback.__name__,
+            error_reply=getattr(plugin_module, 'ERROR_REPLY', DEFAULT_ERROR_REPLY),
+            **spec
+        )
+        self.handler_specs.append(spec)
+        return build_chain(callback, spec, self.middlewares, profile=self.profile)
     
     def load_all_plugins(self, application: Application) -> None:
         """Load and register all plugins from the plugins directory."""
@@ -28,6 +45,9 @@ class PluginLoader:
         
         logger.info(f"Found {len(plugin_files)} plugin files")
         
+        logger.info(f"Handler middleware chain: {' -> '.join(self.middlewares) or '(none)'}")
+        
+        self.handler_specs = []
         for plugin_file in plugin_files:
             self._load_plugin(plugin_file, application)
     
@@ -45,25 +65,66 @@ class PluginLoader:
             
             # Register handlers based on plugin name
             if module_name == "start_plugin" and hasattr(plugin_module, 'start_command'):
-                application.add_handler(CommandHandler("start", plugin_module.start_command))
+                application.add_handler(CommandHandler("start", self._wrap(
+                    plugin_module.start_command, plugin_module, command="start", icon="🚀")))
                 logger.info("Registered /start command")
             
             elif module_name == "help_plugin" and hasattr(plugin_module, 'help_command'):
-                application.add_handler(CommandHandler("help", plugin_module.help_command))
+                application.add_handler(CommandHandler("help", self._wrap(
+                    plugin_module.help_command, plugin_module, command="help", icon="❓")))
                 logger.info("Registered /help command")
             
             elif module_name == "echo_plugin" and hasattr(plugin_module, 'echo_command'):
-                application.add_handler(CommandHandler("echo", plugin_module.echo_command))
+                application.add_handler(CommandHandler("echo", self._wrap(
+                    plugin_module.echo_command, plugin_module, command="echo", icon="🔊")))
                 logger.info("Registered /echo command")
             
+            elif module_name == "broadcast_plugin" and hasattr(plugin_module, 'broadcast_command'):
+                application.add_handler(CommandHandler("broadcast", self._wrap(
+                    plugin_module.broadcast_command, plugin_module, command="broadcast", icon="📣")))
+                logger.info("Registered /broadcast command")
+            
+            elif module_name == "reminder_plugin" and hasattr(plugin_module, 'recordar_command'):
+                application.add_handler(CommandHandler("recordar", self._wrap(
+                    plugin_module.recordar_command, plugin_module, command="recordar", icon="⏰")))
+                logger.info("Registered /recordar command")
+            
             elif module_name == "message_plugin" and hasattr(plugin_module, 'handle_message'):
-                application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, plugin_module.handle_message))
+                application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self._wrap(
+                    plugin_module.handle_message, plugin_module, kind="message")))
                 logger.info("Registered message handler")
             
             elif module_name == "error_plugin" and hasattr(plugin_module, 'error_handler'):
                 application.add_error_handler(plugin_module.error_handler)
                 logger.info("Registered error handler")
             
+            # Any plugin can handle media, inline queries and inline keyboard buttons
+            if hasattr(plugin_module, 'handle_media'):
+                media_filter = getattr(plugin_module, 'MEDIA_FILTER', filters.PHOTO | filters.Document.ALL | filters.VOICE)
+                # Non-blocking: downloads and processing must not hold up other chats
+                application.add_handler(MessageHandler(media_filter, self._wrap(
+                    plugin_module.handle_media, plugin_module, kind="media", icon="📎"), block=False))
+                logger.info(f"Registered media handler from {module_name}")
+            
+            if hasattr(plugin_module, 'inline_query'):
+                # Non-blocking, so debounced queries don't hold up other updates
+                application.add_handler(InlineQueryHandler(self._wrap(
+                    plugin_module.inline_query, plugin_module, kind="inline", icon="🔎"), block=False))
+                logger.info(f"Registered inline query handler from {module_name}")
+            
+            if hasattr(plugin_module, 'callback_query'):
+                application.add_handler(CallbackQueryHandler(self._wrap(
+                    plugin_module.callback_query, plugin_module, kind="callback", icon="🔘"),
+                    pattern=getattr(plugin_module, 'CALLBACK_PATTERN', None)))
+                logger.info(f"Registered callback query handler from {module_name}")
+            
+            # Recurring jobs declared by the plugin; with several hosted bots they run once, as the primary bot
+            if module_name not in self.loaded_plugins:
+                for job in getattr(plugin_module, 'JOBS', ()):
+                    from scheduler import scheduler
+                    scheduler.add_periodic(job)
+                    logger.info(f"Scheduled job '{job.name}' every {job.interval}s from {module_name}")
+            
             self.loaded_plugins[module_name] = plugin_module
             logger.info(f"Successfully loaded plugin: {module_name}")
             
@@ -90,4 +151,4 @@ class PluginLoader:
             return False
 
 # Global plugin loader instance
-plugin_loader = PluginLoader()
\ No newline at end of file
+plugin_loader = PluginLoader(profile=config.MIDDLEWARE_PROFILE)
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Broadcast command plugin.
+Handles the /broadcast admin command that sends a message to every known chat.
+"""
+from typing import Optional
+from telegram import Update
+from telegram.constants import MessageLimit
+from telegram.ext import ContextTypes
+from broadcast import broadcaster as default_broadcaster, get_broadcaster
+from config import config
+from i18n import catalog, user_language
+
+ERROR_REPLY = "error.broadcast"
+
+# Subcommands in every catalog language
+ACTIONS = {
+    'estado': 'status', 'status': 'status',
+    'reanudar': 'resume', 'resume': 'resume',
+    'cancelar': 'cancel', 'cancel': 'cancel'
+}
+
+def _format_progress(progress: Optional[dict], language: str) -> str:
+    """Format broadcast progress for a chat reply."""
+    if not progress:
+        return catalog.text('broadcast.none', language)
+    eta = f"{progress['eta_seconds']}s" if progress['eta_seconds'] is not None else "-"
+    status = catalog.text(f"broadcast.status.{progress['status']}", language)
+    return catalog.text('broadcast.progress', language, **{**progress, 'status': status, 'eta': eta})
+
+async def broadcast_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+    """Handle the /broadcast command (admins only)."""
+    user = update.effective_user
+    if not (user and update.message):
+        return None
+    language = user_language(user)
+    if user.id not in config.ADMIN_IDS:
+        await update.message.reply_text(catalog.text('broadcast.admin_only', language))
+        return "Acceso denegado"
+    
+    # Each hosted bot broadcasts to its own chats
+    broadcaster = get_broadcaster(context.bot.id) or default_broadcaster
+    argument = context.args[0].lower() if context.args else ""
+    # A lone keyword is a subcommand; anything longer is an announcement
+    action = ACTIONS.get(argument) if len(context.args) == 1 else None
+    if not argument:
+        response = catalog.text('broadcast.usage', language)
+    elif action == "status":
+        response = _format_progress(broadcaster.get_progress(), language)
+    elif action == "cancel":
+        response = catalog.text('broadcast.cancelled' if broadcaster.cancel() else 'broadcast.none_running', language)
+    elif broadcaster.is_running:
+        response = catalog.text('broadcast.busy', language)
+    elif action == "resume":
+        progress = await broadcaster.resume()
+        response = _format_progress(progress, language) if progress else catalog.text('broadcast.none_interrupted', language)
+    else:
+        # Keep the admin's original formatting: everything after the command
+        text = update.message.text.split(maxsplit=1)[1]
+        try:
+            response = _format_progress(await broadcaster.start(text), language)
+        except ValueError:
+            response = catalog.text('broadcast.too_long', language,
+                                    length=len(text), max_length=MessageLimit.MAX_TEXT_LENGTH)
+    
+    await update.message.reply_text(response)
+    return response
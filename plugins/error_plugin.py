@@ -5,6 +5,7 @@ Handles errors that occur during bot operation.
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
+from i18n import catalog, user_language
 try:
     from web_server import status_tracker
 except ImportError:
@@ -35,13 +36,11 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
     
     # Log error for web dashboard
     if status_tracker:
-        status_tracker.log_error()
+        status_tracker.log_error(context.bot.username)
     
     # If we have an update with a message, try to inform the user
     if isinstance(update, Update) and update.message:
         try:
-            await update.message.reply_text(
-                "¡Ups! Algo salió mal de mi lado. 🔧 Por favor intenta de nuevo en un momento."
-            )
+            await update.message.reply_text(catalog.text('error.default', user_language(update.effective_user)))
         except Exception as e:
             logger.error(f"Failed to send error message to user: {e}")
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Inline mode plugin.
+Answers "@bot texto" queries from any chat with ready-to-send results.
+"""
+from typing import Optional
+from telegram import InlineQueryResultArticle, InputTextMessageContent, Update
+from telegram.ext import ContextTypes
+from cache import TTLCache
+from config import config
+from i18n import catalog, user_language
+
+# Results only depend on the query and language, so one cached entry serves every user
+results_cache = TTLCache(max_size=config.INLINE_CACHE_SIZE, ttl=config.INLINE_CACHE_TTL)
+
+# Shown while the query is still empty, built once per language
+EMPTY_QUERY_RESULTS = {
+    language: [
+        InlineQueryResultArticle(
+            id="ayuda",
+            title=catalog.text('inline.empty_title', language),
+            description=catalog.text('inline.empty_description', language),
+            input_message_content=InputTextMessageContent(catalog.text('inline.empty_message', language))
+        )
+    ]
+    for language in catalog.languages
+}
+
+def _build_results(query: str, language: str) -> list:
+    """Build the inline results for a query."""
+    reply = catalog.reply(query, catalog.text('default_name', language), language)
+    return [
+        InlineQueryResultArticle(
+            id="respuesta",
+            title=catalog.text('inline.reply_title', language),
+            description=reply,
+            input_message_content=InputTextMessageContent(reply)
+        ),
+        InlineQueryResultArticle(
+            id="eco",
+            title=catalog.text('inline.echo_title', language),
+            description=query,
+            input_message_content=InputTextMessageContent(f"🔊 {query}")
+        )
+    ]
+
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+    """Handle inline queries, reusing cached results for repeated queries."""
+    query = update.inline_query.query.strip()
+    language = user_language(update.inline_query.from_user)
+    if not query:
+        results = EMPTY_QUERY_RESULTS[language]
+    else:
+        results = results_cache.get((language, query))
+        if results is None:
+            results = _build_results(query, language)
+            results_cache.set((language, query), results)
+    
+    # cache_time lets Telegram itself serve repeated queries without asking us
+    await update.inline_query.answer(results, cache_time=config.INLINE_CACHE_TIME)
+    return f"{len(results)} resultados"
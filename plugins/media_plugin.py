@@ -0,0 +1,78 @@
+"""
+Media plugin.
+Handles photos, documents and voice notes: size checks, format detection and previews.
+"""
+from typing import Optional
+from telegram import Update
+from telegram.ext import ContextTypes, filters
+from config import config
+from i18n import catalog, user_language
+from media import media_processor, MediaTooLarge
+
+ERROR_REPLY = "error.media"
+
+# Updates routed to handle_media by the plugin loader
+MEDIA_FILTER = filters.PHOTO | filters.Document.ALL | filters.VOICE
+
+def _format_size(size: int) -> str:
+    """Format a byte count for humans."""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+async def handle_media(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+    """Handle photos, documents and voice notes."""
+    message = update.message
+    if not message:
+        return None
+    
+    language = user_language(update.effective_user)
+    if message.photo:
+        media, label = message.photo[-1], catalog.text('media.photo', language)
+    elif message.voice:
+        media, label = message.voice, catalog.text('media.voice', language)
+    elif message.document:
+        media = message.document
+        label = catalog.text('media.document', language, name=message.document.file_name or '').rstrip()
+    else:
+        return None
+    
+    try:
+        # Only documents get a preview; Telegram already shows photos inline
+        result = await media_processor.process(
+            context.bot, media.file_id, media.file_unique_id, media.file_size,
+            thumbnail=message.document is not None
+        )
+    except MediaTooLarge:
+        response = catalog.text('media.too_large', language, max_size=_format_size(config.MEDIA_MAX_BYTES))
+        await message.reply_text(response)
+        return response
+    
+    lines = [
+        label,
+        catalog.text('media.size', language, size=_format_size(result['size'])),
+        catalog.text('media.format', language, format=result['format'] or catalog.text('media.format_unknown', language))
+    ]
+    if result['dimensions']:
+        width, height = result['dimensions']
+        lines.append(catalog.text('media.dimensions', language, width=width, height=height))
+    if message.voice:
+        duration = message.voice.duration
+        seconds = int(duration.total_seconds() if hasattr(duration, 'total_seconds') else duration)
+        lines.append(catalog.text('media.duration', language, seconds=seconds))
+    lines.append(catalog.text('media.sha256', language, digest=result['sha256'][:16]))
+    response = "\n".join(lines)
+    
+    await message.reply_text(response)
+    
+    # Upload the preview once, then reuse its file_id for repeated files
+    caption = catalog.text('media.preview', language)
+    thumbnail_file_id = result.get('thumbnail_file_ids', {}).get(context.bot.id)
+    if thumbnail_file_id:
+        await message.reply_photo(thumbnail_file_id, caption=caption)
+    elif result.get('thumbnail'):
+        sent = await message.reply_photo(result['thumbnail'], caption=caption)
+        media_processor.remember_thumbnail(media.file_unique_id, context.bot.id, sent.photo[-1].file_id)
+    return response
@@ -0,0 +1,41 @@
+"""
+Reminder command plugin.
+Handles the /recordar command that sends a message back after a delay.
+"""
+from typing import Optional
+from telegram import Update
+from telegram.ext import ContextTypes
+from i18n import catalog, user_language
+from scheduler import scheduler
+
+ERROR_REPLY = "error.reminder"
+
+# One week; Telegram chats can outlive the bot, reminders shouldn't pile up forever
+MAX_MINUTES = 7 * 24 * 60
+
+async def send_reminder(bot, data: dict) -> None:
+    """Scheduled job: deliver a reminder in the language it was asked in."""
+    language = data.get('language', catalog.default_language)
+    await bot.send_message(chat_id=data['chat_id'], text=catalog.text('reminder.message', language, text=data['text']))
+
+async def recordar_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+    """Handle the /recordar command."""
+    if not (update.message and update.effective_chat):
+        return None
+    
+    language = user_language(update.effective_user)
+    args = context.args or []
+    if len(args) < 2 or not args[0].isdigit() or not 0 < int(args[0]) <= MAX_MINUTES:
+        response = catalog.text('reminder.usage', language)
+    else:
+        minutes = int(args[0])
+        scheduler.schedule(send_reminder, minutes * 60, {
+            'chat_id': update.effective_chat.id,
+            'text': " ".join(args[1:]),
+            'language': language
+        }, bot_id=context.bot.id)
+        response = (catalog.text('reminder.scheduled_one', language) if minutes == 1
+                    else catalog.text('reminder.scheduled', language, minutes=minutes))
+    
+    await update.message.reply_text(response)
+    return response
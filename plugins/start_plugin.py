@@ -2,54 +2,32 @@
 Start command plugin.
 Handles the /start command with welcome message.
 """
-import logging
-from telegram import Update
+from typing import Optional
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
-try:
-    from web_server import status_tracker
-except ImportError:
-    status_tracker = None
+from i18n import catalog, user_language
 
-logger = logging.getLogger(__name__)
+ERROR_REPLY = "error.default"
 
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle the /start command."""
-    try:
-        user = update.effective_user
-        if user and update.message:
-            welcome_message = f"""
-🤖 *¡Bienvenido al Bot, {user.first_name or 'Amigo'}!*
-
-Estoy aquí para ayudarte con varias tareas. Esto es lo que puedo hacer:
+# Button handled by help_plugin's callback_query, built once per language
+HELP_KEYBOARDS = {
+    language: InlineKeyboardMarkup([[InlineKeyboardButton(catalog.text('start.help_button', language),
+                                                          callback_data="help")]])
+    for language in catalog.languages
+}
 
-• `/start` - Mostrar este mensaje de bienvenida
-• `/help` - Obtener ayuda y ver comandos disponibles
-• ¡Envíame cualquier mensaje de texto y te responderé!
-
-Siéntete libre de explorar e interactuar conmigo. Escribe /help para más información.
-            """
-            
-            await update.message.reply_text(
-                welcome_message,
-                parse_mode=ParseMode.MARKDOWN
-            )
-            
-            # Log statistics for web dashboard
-            if status_tracker:
-                status_tracker.log_command(user.id)
-            
-            # Decorated console output
-            print(f"\n🚀 Mensaje recibido: /start")
-            print(f"👤 Usuario: {user.id}")
-            print(f"🤖 Respuesta: Mensaje de bienvenida enviado")
-            print("═" * 50)
-            
-            logger.info(f"User {user.id} ({user.username or 'unknown'}) started the bot")
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+    """Handle the /start command."""
+    user = update.effective_user
+    if user and update.message:
+        language = user_language(user)
+        welcome_message = catalog.text('start.welcome', language,
+                                       name=user.first_name or catalog.text('default_name', language))
         
-    except Exception as e:
-        logger.error(f"Error in start_command: {e}")
-        if update.message:
-            await update.message.reply_text(
-                "Lo siento, algo salió mal. Por favor intenta de nuevo más tarde."
-            )
\ No newline at end of file
+        await update.message.reply_text(
+            welcome_message,
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=HELP_KEYBOARDS[language]
+        )
+        return "Mensaje de bienvenida enviado"
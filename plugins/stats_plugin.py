@@ -0,0 +1,28 @@
+"""
+Statistics rollup plugin.
+Writes an hourly summary of the bot's activity to the log.
+"""
+import logging
+from scheduler import PeriodicJob
+try:
+    from web_server import status_tracker
+except ImportError:
+    status_tracker = None
+
+logger = logging.getLogger(__name__)
+
+async def stats_rollup(bot, data: dict) -> None:
+    """Scheduled job: log lifetime totals and the last hour's rates."""
+    if not status_tracker:
+        return
+    rates = status_tracker.get_rates()
+    logger.info(
+        f"Hourly rollup - messages: {status_tracker.message_count} ({rates['messages']['rate_1h']}/s), "
+        f"commands: {status_tracker.command_count} ({rates['commands']['rate_1h']}/s), "
+        f"errors: {status_tracker.error_count}, dropped: {status_tracker.dropped_count}, "
+        f"users: {len(status_tracker.active_users)}"
+    )
+
+JOBS = [
+    PeriodicJob("stats_rollup", stats_rollup, interval=3600)
+]
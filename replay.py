@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Record and replay Telegram update traffic.
+Records real incoming updates to a compressed JSONL log, and replays them
+through the loaded plugins against a stubbed Bot API, optionally under a
+sampling profiler, to reproduce hot spots offline.
+
+    python replay.py record updates.jsonl.gz
+    python replay.py play updates.jsonl.gz --speed max --profile out.folded
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import asyncio
+import logging
+import argparse
+import threading
+import contextlib
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Throttling and debouncing run on the live clock, not the recorded one, so
+# replaying faster than real time would drop updates that got through live
+UNTIMED_MIDDLEWARES = ('throttle', 'debounce')
+
+class UpdateRecorder:
+    """Appends every incoming update to a gzip-compressed JSONL file.
+
+    Each line is ``{"t": <unix time>, "update": <Update.to_dict()>}``.
+    Appending adds a new gzip member, which readers handle transparently.
+    """
+
+    def __init__(self, path: str, flush_every: int = 100):
+        self.path = path
+        self.flush_every = flush_every
+        self.count = 0
+        self._file = None
+
+    async def record(self, update, context) -> None:
+        """Handler callback; installed in its own group so it never stops an update."""
+        if self._file is None:
+            self._file = gzip.open(self.path, 'at', encoding='utf-8')
+            logger.info(f"Recording updates to {self.path}")
+        self._file.write(json.dumps({'t': time.time(), 'update': update.to_dict()}, ensure_ascii=False) + '\n')
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        """Flush and close the log."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Recorded {self.count} updates to {self.path}")
+
+def read_log(path: str):
+    """Yield ``(timestamp, update_dict)`` pairs from a recorded log."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as log:
+        for line in log:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry['t'], entry['update']
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval.
+
+    Output uses the folded-stack format (``frame;frame;frame count``) read by
+    flamegraph.pl, speedscope and similar flame graph tools.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _sample(self):
+        own_dir = os.path.dirname(os.path.abspath(__file__))
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = code.co_filename
+                if filename.startswith(own_dir):
+                    filename = os.path.relpath(filename, own_dir)
+                else:
+                    filename = os.path.basename(filename)
+                stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as output:
+            for stack, count in self.samples.most_common():
+                output.write(f"{stack} {count}\n")
+
+def make_stub_request(api_latency: float = 0.0):
+    """Build a Bot API stub that answers every call locally with plausible results."""
+    from telegram.request import BaseRequest
+
+    class StubRequest(BaseRequest):
+        calls = Counter()
+
+        @property
+        def read_timeout(self):
+            return None
+
+        async def initialize(self):
+            pass
+
+        async def shutdown(self):
+            pass
+
+        async def do_request(self, url, method, request_data=None, read_timeout=None,
+                             write_timeout=None, connect_timeout=None, pool_timeout=None):
+            api_method = url.rsplit('/', 1)[-1]
+            params = request_data.parameters if request_data else {}
+            StubRequest.calls[api_method] += 1
+            if api_latency:
+                await asyncio.sleep(api_latency)
+
+            if api_method == 'getMe':
+                result = {'id': 1, 'is_bot': True, 'first_name': 'Replay', 'username': 'replay_bot'}
+            elif api_method == 'getFile':
+                result = {'file_id': params.get('file_id'), 'file_unique_id': params.get('file_id'),
+                          'file_path': f"replay/{params.get('file_id')}"}
+            elif api_method.startswith('send') or api_method.startswith('edit'):
+                result = {
+                    'message_id': StubRequest.calls.total(),
+                    'date': int(time.time()),
+                    'chat': {'id': params.get('chat_id') or 0, 'type': 'private'},
+                    'text': params.get('text'),
+                    'photo': [{'file_id': f"replay-{api_method}", 'file_unique_id': 'replay', 'width': 1, 'height': 1}]
+                    if api_method == 'sendPhoto' else None
+                }
+            else:
+                result = True
+            return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+    return StubRequest
+
+async def replay(path: str, speed: float = None, api_latency: float = 0.0, limit: int = None,
+                 middlewares: list = None) -> dict:
+    """Feed a recorded log through the plugins; ``speed=None`` means as fast as possible.
+
+    ``middlewares`` defaults to the configured chain without UNTIMED_MIDDLEWARES.
+    """
+    import httpx
+    from telegram import Update
+    from telegram.ext import Application
+    from config import config
+    from plugin_loader import PluginLoader
+    from web_server import status_tracker
+    from media import media_processor
+
+    if middlewares is None:
+        middlewares = [name for name in config.MIDDLEWARES if name not in UNTIMED_MIDDLEWARES]
+    plugin_loader = PluginLoader(middlewares=middlewares, profile=config.MIDDLEWARE_PROFILE)
+
+    StubRequest = make_stub_request(api_latency)
+    application = (Application.builder().token("0:replay")
+                   .request(StubRequest()).get_updates_request(StubRequest()).build())
+    plugin_loader.load_all_plugins(application)
+    # Media downloads go straight to the file server, so stub those too
+    media_processor._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b'\0' * 1024)))
+
+    count = 0
+    started = time.perf_counter()
+    async with application:
+        await application.start()
+        first_recorded = None
+        for recorded_at, data in read_log(path):
+            if limit is not None and count >= limit:
+                break
+            if speed:
+                # Keep the recorded spacing between updates, scaled by speed
+                first_recorded = first_recorded or recorded_at
+                delay = (recorded_at - first_recorded) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await application.process_update(Update.de_json(data, application.bot))
+            count += 1
+        await application.stop()
+    await media_processor.shutdown()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'updates': count,
+        'seconds': round(elapsed, 3),
+        'updates_per_second': round(count / elapsed, 1) if elapsed else 0.0,
+        'api_calls': dict(StubRequest.calls),
+        'handlers': status_tracker.get_handler_timings(),
+        'dropped': status_tracker.dropped_count,
+        'errors': status_tracker.error_count
+    }
+
+def parse_speed(value: str):
+    """``max`` for no delays, otherwise a multiplier such as ``1``, ``10`` or ``10x``."""
+    if value.lower() == 'max':
+        return None
+    speed = float(value.lower().rstrip('x'))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay Telegram update traffic.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="run the bot and record incoming updates")
+    record.add_argument('log', help="output file, e.g. updates.jsonl.gz")
+
+    play = commands.add_parser('play', help="replay a recorded log through the plugins")
+    play.add_argument('log', help="recorded file (.jsonl or .jsonl.gz)")
+    play.add_argument('--speed', type=parse_speed, default=None,
+                      help="1 for real time, N (or Nx) for N times faster, max for no delays (default)")
+    play.add_argument('--limit', type=int, help="stop after this many updates")
+    play.add_argument('--api-latency', type=float, default=0.0, help="simulated Bot API latency in seconds")
+    play.add_argument('--middlewares',
+                      help="middleware chain, e.g. errors,stats,timing (default: MIDDLEWARES without throttle "
+                           "and debounce, which would drop updates when replaying faster than recorded)")
+    play.add_argument('--database', default=':memory:', help="database for the replay (default: in memory)")
+    play.add_argument('--profile', metavar='FILE', help="write sampled stacks in folded flame graph format")
+    play.add_argument('--interval', type=float, default=0.005, help="sampling interval in seconds")
+    play.add_argument('--cprofile', metavar='FILE', help="write deterministic cProfile stats")
+    play.add_argument('--report', metavar='FILE', help="write the summary as JSON, to compare versions")
+    args = parser.parse_args(argv)
+
+    # Configuration is read at import time, so set overrides before importing the bot
+    if args.command == 'record':
+        os.environ['RECORD_UPDATES'] = args.log
+        import main as bot_main
+        bot_main.run_bot()
+        return
+
+    os.environ['DATABASE_PATH'] = args.database
+    middlewares = [name.strip() for name in args.middlewares.split(',')] if args.middlewares is not None else None
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.WARNING)
+
+    profiler = SamplingProfiler(args.interval) if args.profile else None
+    cprofile = None
+    if args.cprofile:
+        import cProfile
+        cprofile = cProfile.Profile()
+
+    if profiler:
+        profiler.start()
+    if cprofile:
+        cprofile.enable()
+    try:
+        # The logging middleware prints every update; keep stdout for the JSON summary
+        with contextlib.redirect_stdout(sys.stderr):
+            summary = asyncio.run(replay(args.log, args.speed, args.api_latency, args.limit, middlewares))
+    finally:
+        if cprofile:
+            cprofile.disable()
+            cprofile.dump_stats(args.cprofile)
+        if profiler:
+            profiler.stop()
+            profiler.write(args.profile)
+
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as report:
+            json.dump(summary, report, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Scheduled jobs for the Telegram bot.
+Runs periodic and delayed plugin work (reminders, digests, stats rollups)
+on the bot's event loop, backed by the persistent job store.
+"""
+import os
+import json
+import time
+import heapq
+import uuid
+import socket
+import asyncio
+import logging
+import importlib
+from typing import Callable, NamedTuple, Optional
+from telegram.ext import Application
+from config import config
+from storage import storage, Storage
+
+logger = logging.getLogger(__name__)
+
+class PeriodicJob(NamedTuple):
+    """A recurring job declared by a plugin in its ``JOBS`` list.
+
+    ``callback`` is an ``async def job(bot, data)`` function at module level.
+    ``first`` is the delay before the first run; it defaults to ``interval``.
+    """
+    name: str
+    callback: Callable
+    interval: float
+    first: Optional[float] = None
+
+class Scheduler:
+    """Heap-based job scheduler with a single timer.
+
+    All pending run times sit in a min-heap, and one task sleeps until the
+    earliest of them, so adding a job is O(log n) and the number of pending
+    jobs doesn't add timers or wakeups. Jobs are persisted in storage; a
+    worker claims a due job with a lease before running it, so several bot
+    processes sharing the database split the jobs between them without
+    running any job twice. Periodic runs missed during downtime are
+    coalesced into a single run. Jobs created for one of several hosted
+    bots remember it and run as that bot; workers that don't host the bot
+    leave its jobs for one that does.
+    """
+
+    def __init__(self, store: Storage, lease: float = 300, poll_interval: float = 30, worker_id: str = None,
+                 clock=time.time):
+        self.store = store
+        self.lease = lease
+        self.poll_interval = poll_interval
+        # Unix time, shared by every worker through the job store
+        self.clock = clock
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.application = None
+        # Hosted bots by id, for jobs that must run as a particular bot
+        self.bots = {}
+        self._heap = []
+        # job id -> run time of its live heap entry; older entries are stale
+        self._scheduled = {}
+        self._callbacks = {}
+        self._running = set()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._scheduled)
+
+    def register_callback(self, callback: Callable) -> str:
+        """Get the stable name a callback is stored under."""
+        name = f"{callback.__module__}:{callback.__qualname__}"
+        self._callbacks[name] = callback
+        return name
+
+    def _resolve(self, name: str) -> Callable:
+        """Find a stored callback, importing its module if needed."""
+        callback = self._callbacks.get(name)
+        if callback is None:
+            module_name, _, attribute = name.partition(':')
+            callback = getattr(importlib.import_module(module_name), attribute)
+            self._callbacks[name] = callback
+        return callback
+
+    def add_periodic(self, job: PeriodicJob):
+        """Declare a recurring job; a persisted schedule survives restarts."""
+        first_run = self.clock() + (job.interval if job.first is None else job.first)
+        row = self.store.save_periodic_job(job.name, self.register_callback(job.callback), job.interval, first_run)
+        self._push(job.name, row['next_run'])
+
+    def schedule(self, callback: Callable, delay: float, data: dict = None, job_id: str = None,
+                 bot_id: int = None) -> str:
+        """Run ``callback(bot, data)`` once, ``delay`` seconds from now.
+
+        Pass ``bot_id`` to run it as that hosted bot instead of the first one.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        next_run = self.clock() + delay
+        self.store.add_job(job_id, self.register_callback(callback), next_run,
+                           json.dumps(data) if data is not None else None, bot_id=bot_id)
+        self._push(job_id, next_run)
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a pending job."""
+        self._scheduled.pop(job_id, None)
+        return self.store.delete_job(job_id)
+
+    def _push(self, job_id: str, next_run: float):
+        """Add a run time to the heap; any older entry for the job goes stale."""
+        self._scheduled[job_id] = next_run
+        heapq.heappush(self._heap, (next_run, job_id))
+        if self._heap[0][1] == job_id:
+            # New earliest deadline: wake the timer so it can sleep less
+            self._wakeup.set()
+
+    def add_bot(self, bot):
+        """Let jobs run as another hosted bot."""
+        self.bots[bot.id] = bot
+
+    def _hosts(self, bot_id: Optional[int]) -> bool:
+        """Whether this worker can run jobs bound to ``bot_id``."""
+        return bot_id is None or bot_id in self.bots
+
+    def start(self, application: Application):
+        """Load persisted jobs and start the timer on the running event loop."""
+        self.application = application
+        self.add_bot(application.bot)
+        for job_id, next_run, _, bot_id in self.store.iter_job_schedule():
+            if self._hosts(bot_id) and self._scheduled.get(job_id) != next_run:
+                self._push(job_id, next_run)
+        self._task = asyncio.create_task(self._run(), name="scheduler")
+        logger.info(f"Scheduler started as {self.worker_id} with {self.pending_count} pending jobs")
+
+    async def stop(self):
+        """Stop the timer and wait for running jobs to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _run(self):
+        next_sync = self.clock() + self.poll_interval
+        while True:
+            now = self.clock()
+            self._dispatch_due(now)
+
+            if now >= next_sync:
+                self._sync(now)
+                next_sync = now + self.poll_interval
+
+            heap = self._heap
+            delay = min(heap[0][0] if heap else next_sync, next_sync) - self.clock()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch_due(self, now: float):
+        """Start every job whose run time has come; only due entries at the top of the heap are touched."""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            next_run, job_id = heapq.heappop(heap)
+            if self._scheduled.get(job_id) != next_run:
+                continue
+            del self._scheduled[job_id]
+            self._dispatch(job_id, next_run, now)
+
+    def _sync(self, now: float):
+        """Pick up jobs that other workers added or rescheduled."""
+        for job_id, next_run, lease_until, bot_id in self.store.iter_job_schedule(before=now + self.poll_interval):
+            if (lease_until is not None and lease_until > now) or not self._hosts(bot_id):
+                continue
+            if self._scheduled.get(job_id) != next_run:
+                self._push(job_id, next_run)
+
+    def _dispatch(self, job_id: str, next_run: float, now: float):
+        """Claim a due job and run it in its own task."""
+        job = self.store.claim_job(job_id, next_run, self.worker_id, now + self.lease, now)
+        if job is None:
+            # Another worker has it or already ran it: follow the stored schedule
+            current = self.store.get_job(job_id)
+            if current and self._hosts(current['bot_id']):
+                lease_until = current['lease_until'] or 0
+                self._push(job_id, max(current['next_run'], lease_until if lease_until > now else 0))
+            return
+        task = asyncio.create_task(self._execute(job, now), name=f"job-{job_id}")
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _execute(self, job: dict, now: float):
+        job_id = job['id']
+        try:
+            callback = self._resolve(job['callback'])
+            data = json.loads(job['data']) if job['data'] else {}
+            bot = self.application.bot if job['bot_id'] is None else self.bots.get(job['bot_id'])
+            if bot is None:
+                # Another worker may host the bot: release the job, unchanged, for it
+                logger.warning(f"Job {job_id} left for another worker: bot {job['bot_id']} is not hosted here")
+                self.store.reschedule_job(job_id, job['next_run'])
+                return
+            await callback(bot, data)
+        except asyncio.CancelledError:
+            # Shutting down mid-run: the lease expires and the job runs again later
+            raise
+        except Exception as e:
+            logger.error(f"Scheduled job {job_id} failed: {e}")
+
+        interval = job['interval']
+        if not interval:
+            self.store.delete_job(job_id)
+            return
+        # Runs missed while the bot was down collapse into this one
+        missed = int((now - job['next_run']) // interval)
+        if missed:
+            logger.info(f"Job {job_id}: coalesced {missed} missed runs")
+        next_run = job['next_run'] + (missed + 1) * interval
+        self.store.reschedule_job(job_id, next_run)
+        self._push(job_id, next_run)
+
+# Global scheduler instance
+scheduler = Scheduler(
+    storage,
+    lease=config.SCHEDULER_LEASE,
+    poll_interval=config.SCHEDULER_POLL,
+    worker_id=config.WORKER_ID or None
+)
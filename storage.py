@@ -0,0 +1,217 @@
+"""
+Persistent storage for the Telegram bot.
+Keeps known chats, broadcast checkpoints and scheduled jobs in a local SQLite database.
+"""
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Iterator, Optional
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Lowest possible chat id; group and channel ids are negative
+MIN_CHAT_ID = -(2 ** 63)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    bot_id INTEGER NOT NULL DEFAULT 0,
+    chat_id INTEGER NOT NULL,
+    chat_type TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (bot_id, chat_id)
+);
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bot_id INTEGER NOT NULL DEFAULT 0,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_chat_id INTEGER NOT NULL,
+    sent INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    callback TEXT NOT NULL,
+    data TEXT,
+    interval REAL,
+    next_run REAL NOT NULL,
+    owner TEXT,
+    lease_until REAL,
+    bot_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_next_run ON jobs (next_run);
+"""
+
+class Storage:
+    """Small SQLite wrapper used from the bot's event loop thread.
+
+    Chats and broadcasts belong to one bot (``bot_id``), so several bots
+    hosted by the same process never message each other's chats.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        # Chats already written during this process, to skip repeated inserts
+        self._known_chats = set()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            logger.info(f"Opened database: {self.path}")
+        return self._conn
+
+    def close(self):
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def remember_chat(self, chat_id: int, chat_type: str = None, bot_id: int = 0):
+        """Store a chat so broadcasts can reach it later."""
+        key = (bot_id, chat_id)
+        if key in self._known_chats:
+            return
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO chats (bot_id, chat_id, chat_type, first_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(bot_id, chat_id) DO UPDATE SET active = 1",
+                (bot_id, chat_id, chat_type, datetime.now().isoformat())
+            )
+        self._known_chats.add(key)
+
+    def deactivate_chat(self, chat_id: int, bot_id: int = 0):
+        """Stop sending broadcasts to a chat (e.g. the user blocked the bot)."""
+        with self.conn:
+            self.conn.execute("UPDATE chats SET active = 0 WHERE bot_id = ? AND chat_id = ?", (bot_id, chat_id))
+        self._known_chats.discard((bot_id, chat_id))
+
+    def count_chats(self, after: int = MIN_CHAT_ID, bot_id: int = 0) -> int:
+        """Count a bot's active chats with an id greater than ``after``."""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM chats WHERE bot_id = ? AND active = 1 AND chat_id > ?", (bot_id, after)
+        ).fetchone()
+        return row[0]
+
+    def iter_chat_chunks(self, after: int = MIN_CHAT_ID, size: int = 100, bot_id: int = 0) -> Iterator[list]:
+        """Yield active chat ids in ascending chunks, resuming after ``after``.
+
+        Uses keyset pagination, so each chunk is one indexed range query and
+        only one chunk is held in memory at a time.
+        """
+        while True:
+            rows = self.conn.execute(
+                "SELECT chat_id FROM chats WHERE bot_id = ? AND active = 1 AND chat_id > ? "
+                "ORDER BY chat_id LIMIT ?",
+                (bot_id, after, size)
+            ).fetchall()
+            if not rows:
+                return
+            chunk = [row[0] for row in rows]
+            yield chunk
+            after = chunk[-1]
+
+    def create_broadcast(self, text: str, total: int, bot_id: int = 0) -> dict:
+        """Create a new running broadcast and return its state."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO broadcasts (bot_id, text, status, last_chat_id, total, created_at) "
+                "VALUES (?, ?, 'running', ?, ?, ?)",
+                (bot_id, text, MIN_CHAT_ID, total, datetime.now().isoformat())
+            )
+        return self.get_broadcast(cursor.lastrowid)
+
+    def get_broadcast(self, broadcast_id: int) -> Optional[dict]:
+        """Get a broadcast by id."""
+        row = self.conn.execute("SELECT * FROM broadcasts WHERE id = ?", (broadcast_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_unfinished_broadcast(self, bot_id: int = 0) -> Optional[dict]:
+        """Get a bot's most recent broadcast that was interrupted."""
+        row = self.conn.execute(
+            "SELECT * FROM broadcasts WHERE bot_id = ? AND status = 'running' ORDER BY id DESC LIMIT 1",
+            (bot_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def save_broadcast(self, state: dict):
+        """Checkpoint a broadcast's progress."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE broadcasts SET status = ?, last_chat_id = ?, sent = ?, failed = ?, total = ?, finished_at = ? "
+                "WHERE id = ?",
+                (state['status'], state['last_chat_id'], state['sent'], state['failed'],
+                 state['total'], state.get('finished_at'), state['id'])
+            )
+
+    def save_periodic_job(self, job_id: str, callback: str, interval: float, first_run: float) -> dict:
+        """Create a periodic job, or update it while keeping its persisted next run."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (id, callback, interval, next_run) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET callback = excluded.callback, interval = excluded.interval",
+                (job_id, callback, interval, first_run)
+            )
+        return self.get_job(job_id)
+
+    def add_job(self, job_id: str, callback: str, next_run: float, data: str = None, interval: float = None,
+                bot_id: int = None):
+        """Create or replace a job; ``bot_id`` is the bot it must run as (None: any)."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, callback, data, interval, next_run, bot_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, callback, data, interval, next_run, bot_id)
+            )
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Get a job by id."""
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def iter_job_schedule(self, before: float = None) -> Iterator[tuple]:
+        """Yield ``(id, next_run, lease_until, bot_id)`` of every job, or only those due before ``before``."""
+        if before is None:
+            cursor = self.conn.execute("SELECT id, next_run, lease_until, bot_id FROM jobs")
+        else:
+            cursor = self.conn.execute(
+                "SELECT id, next_run, lease_until, bot_id FROM jobs WHERE next_run < ?", (before,)
+            )
+        for row in cursor:
+            yield tuple(row)
+
+    def claim_job(self, job_id: str, next_run: float, owner: str, lease_until: float, now: float) -> Optional[dict]:
+        """Take a due job for ``owner`` unless another worker holds or already ran it."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET owner = ?, lease_until = ? "
+                "WHERE id = ? AND next_run = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (owner, lease_until, job_id, next_run, now)
+            )
+        return self.get_job(job_id) if cursor.rowcount else None
+
+    def reschedule_job(self, job_id: str, next_run: float):
+        """Set a job's next run and release its lease."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET next_run = ?, owner = NULL, lease_until = NULL WHERE id = ?",
+                (next_run, job_id)
+            )
+
+    def delete_job(self, job_id: str) -> bool:
+        """Remove a job; returns False if it didn't exist."""
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return cursor.rowcount > 0
+
+# Global storage instance
+storage = Storage(config.DATABASE_PATH)
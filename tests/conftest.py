@@ -0,0 +1,195 @@
+"""
+Shared fixtures for the plugin tests.
+Builds fake updates, a stubbed Bot API that records every call, and an
+Application with all plugins loaded, so handlers run exactly as they do
+in production without network access.
+"""
+import os
+
+# Must be set before config is imported: keep test data out of bot_data.db
+os.environ['DATABASE_PATH'] = ':memory:'
+
+import json
+import time
+import asyncio
+import tracemalloc
+from typing import Optional
+import pytest
+from telegram import Update
+from telegram.ext import Application
+from telegram.request import BaseRequest
+
+# Production chain minus throttling and inline debouncing, which would make
+# repeated test updates depend on timing
+TEST_MIDDLEWARES = ['errors', 'stats', 'chats', 'logging', 'timing']
+
+BOT_ID = 1000
+
+class StubRequest(BaseRequest):
+    """Answers Bot API calls locally and records them as ``(method, params)``."""
+
+    def __init__(self, bot_id: int = BOT_ID):
+        self.bot_id = bot_id
+        self.calls = []
+        # API methods that should fail, to exercise error handling
+        self.fail_methods = set()
+        self.fail_description = 'Bad Request: chat not found'
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None,
+                         write_timeout=None, connect_timeout=None, pool_timeout=None):
+        api_method = url.rsplit('/', 1)[-1]
+        params = request_data.parameters if request_data else {}
+        self.calls.append((api_method, params))
+        if api_method in self.fail_methods:
+            return 400, json.dumps({'ok': False, 'error_code': 400,
+                                    'description': self.fail_description}).encode()
+
+        if api_method == 'getMe':
+            username = 'test_bot' if self.bot_id == BOT_ID else f'test_bot_{self.bot_id}'
+            result = {'id': self.bot_id, 'is_bot': True, 'first_name': 'Test', 'username': username}
+        elif api_method == 'getFile':
+            result = {'file_id': params['file_id'], 'file_unique_id': params['file_id'],
+                      'file_path': f"files/{params['file_id']}"}
+        elif api_method.startswith('send'):
+            result = {'message_id': len(self.calls), 'date': 0, 'text': params.get('text'),
+                      'chat': {'id': params.get('chat_id'), 'type': 'private'}}
+            if api_method == 'sendPhoto':
+                # file_ids belong to the bot that uploaded the file
+                result['photo'] = [{'file_id': f'thumb-{self.bot_id}', 'file_unique_id': 'thumb',
+                                    'width': 1, 'height': 1}]
+        else:
+            result = True
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+def make_user(user_id: int = 42, language_code: str = 'es', first_name: str = 'Ana') -> dict:
+    return {'id': user_id, 'is_bot': False, 'first_name': first_name, 'language_code': language_code}
+
+def message_update(text: str = None, update_id: int = 1, user_id: int = 42, language_code: str = 'es',
+                   **fields) -> dict:
+    """A private-chat message; commands get their bot_command entity."""
+    message = {
+        'message_id': update_id, 'date': 0,
+        'chat': {'id': user_id, 'type': 'private'},
+        'from': make_user(user_id, language_code),
+        **fields
+    }
+    if text is not None:
+        message['text'] = text
+        if text.startswith('/'):
+            message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+    return {'update_id': update_id, 'message': message}
+
+def callback_update(data: str, update_id: int = 1, user_id: int = 42, language_code: str = 'es') -> dict:
+    """A press on an inline keyboard button under one of the bot's messages."""
+    return {'update_id': update_id, 'callback_query': {
+        'id': str(update_id), 'chat_instance': 'test', 'data': data,
+        'from': make_user(user_id, language_code),
+        'message': {'message_id': 1, 'date': 0, 'chat': {'id': user_id, 'type': 'private'}, 'text': 'menu'}
+    }}
+
+def inline_update(query: str, update_id: int = 1, user_id: int = 42, language_code: str = 'es') -> dict:
+    """An "@bot query" inline query."""
+    return {'update_id': update_id, 'inline_query': {
+        'id': str(update_id), 'query': query, 'offset': '', 'from': make_user(user_id, language_code)
+    }}
+
+class BotHarness:
+    """An initialized Application wired to a StubRequest, on its own event loop."""
+
+    def __init__(self, middlewares: list = None, bot_id: int = BOT_ID):
+        from plugin_loader import PluginLoader
+
+        self.loop = asyncio.new_event_loop()
+        self.request = StubRequest(bot_id)
+        self.application = (Application.builder().token(f"{bot_id}:test")
+                            .request(self.request).get_updates_request(StubRequest()).build())
+        self.loader = PluginLoader(middlewares=TEST_MIDDLEWARES if middlewares is None else middlewares)
+        self.loader.load_all_plugins(self.application)
+        self.run(self.application.initialize())
+        # Running, so non-blocking handlers are tracked like in production
+        self.run(self.application.start())
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    async def _process(self, data: dict):
+        running = asyncio.all_tasks()
+        await self.application.process_update(Update.de_json(data, self.application.bot))
+        # Non-blocking handlers (media, inline) run as separate tasks
+        spawned = asyncio.all_tasks() - running
+        if spawned:
+            await asyncio.gather(*spawned)
+
+    def process(self, data: dict) -> list:
+        """Feed one update through the handlers; returns the Bot API calls it made."""
+        start = len(self.request.calls)
+        self.run(self._process(data))
+        return self.request.calls[start:]
+
+    def measure(self, data: dict) -> dict:
+        """Like ``process``, also recording wall time and peak allocations."""
+        start = len(self.request.calls)
+        tracemalloc.start()
+        began = time.perf_counter()
+        try:
+            self.run(self._process(data))
+            elapsed = time.perf_counter() - began
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {'ms': elapsed * 1000, 'peak_kb': peak / 1024, 'calls': self.request.calls[start:]}
+
+    def close(self):
+        self.run(self.application.stop())
+        self.run(self.application.shutdown())
+        self.loop.close()
+
+@pytest.fixture
+def bot():
+    harness = BotHarness()
+    yield harness
+    harness.close()
+
+@pytest.fixture
+def status_tracker():
+    """The global tracker, reset so counts only reflect the current test."""
+    import web_server
+    tracker = web_server.status_tracker
+    fresh = web_server.BotStatusTracker()
+    saved = dict(tracker.__dict__)
+    tracker.__dict__.update(fresh.__dict__)
+    yield tracker
+    tracker.__dict__.clear()
+    tracker.__dict__.update(saved)
+
+# Per-handler measurements collected by test_handlers, shown after the run
+HANDLER_REPORT = {}
+
+def pytest_addoption(parser):
+    parser.addoption('--handler-report', metavar='FILE',
+                     help="write per-handler time, allocations and output as JSON")
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not HANDLER_REPORT:
+        return
+    terminalreporter.section("handler benchmarks")
+    terminalreporter.write_line(f"{'scenario':<28}{'handler':<20}{'ms':>9}{'peak KB':>10}  output")
+    for scenario, row in HANDLER_REPORT.items():
+        output = (row['output'] or '').replace('\n', ' ')[:40]
+        terminalreporter.write_line(
+            f"{scenario:<28}{row['handler']:<20}{row['ms']:>9.3f}{row['peak_kb']:>10.1f}  {output}"
+        )
+    path = config.getoption('--handler-report')
+    if path:
+        with open(path, 'w', encoding='utf-8') as report:
+            json.dump(HANDLER_REPORT, report, indent=2, ensure_ascii=False)
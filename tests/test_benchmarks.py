@@ -0,0 +1,85 @@
+"""
+Performance regression thresholds for the hot paths.
+Limits are several times the measured cost on a developer laptop, so they
+only trip on real regressions; set BENCHMARK_TOLERANCE=2 to double them on
+slow CI machines.
+"""
+import io
+import os
+import time
+import tracemalloc
+import contextlib
+from telegram.ext import Application
+from conftest import TEST_MIDDLEWARES, StubRequest, message_update
+from plugin_loader import PluginLoader
+from plugins.message_plugin import _process_message
+from web_server import BotStatusTracker
+
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "1"))
+
+THRESHOLDS = {
+    # One text message through the full middleware chain, Bot API stubbed
+    'handle_message_ms': 10.0,
+    'handle_message_peak_kb': 512,
+    'process_message_us': 100.0,
+    'log_message_us': 30.0,
+    'load_plugins_ms': 50.0,
+}
+
+def _limit(name: str) -> float:
+    return THRESHOLDS[name] * TOLERANCE
+
+def test_handle_message_time(bot):
+    # The logging middleware prints every update; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for update_id in range(20):
+            bot.process(message_update('hola', update_id=update_id))
+        runs = 300
+        start = time.perf_counter()
+        for update_id in range(runs):
+            bot.process(message_update('cuéntame algo interesante', update_id=update_id, user_id=update_id))
+        mean_ms = (time.perf_counter() - start) * 1000 / runs
+    assert mean_ms < _limit('handle_message_ms'), f"handle_message: {mean_ms:.3f} ms per update"
+
+def test_handle_message_allocations(bot):
+    worst_kb = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot.process(message_update('hola'))
+        tracemalloc.start()
+        try:
+            for update_id in range(50):
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                bot.process(message_update('cuéntame algo', update_id=update_id))
+                worst_kb = max(worst_kb, (tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+        finally:
+            tracemalloc.stop()
+    assert worst_kb < _limit('handle_message_peak_kb'), f"handle_message: {worst_kb:.1f} KB peak"
+
+def test_process_message_time():
+    messages = ['hola', '¿qué hora es?', 'gracias', 'esto es genial', 'cuéntame algo interesante']
+    runs = 20000
+    start = time.perf_counter()
+    for index in range(runs):
+        _process_message(messages[index % len(messages)], 'Ana', 'es')
+    mean_us = (time.perf_counter() - start) * 1e6 / runs
+    assert mean_us < _limit('process_message_us'), f"_process_message: {mean_us:.2f} µs per call"
+
+def test_status_tracker_log_time():
+    tracker = BotStatusTracker()
+    runs = 100000
+    start = time.perf_counter()
+    for index in range(runs):
+        tracker.log_message(index % 100, 'test_bot')
+    mean_us = (time.perf_counter() - start) * 1e6 / runs
+    assert mean_us < _limit('log_message_us'), f"log_message: {mean_us:.2f} µs per call"
+
+def test_plugin_registration_time():
+    runs = 10
+    start = time.perf_counter()
+    for _ in range(runs):
+        application = (Application.builder().token("1:test")
+                       .request(StubRequest()).get_updates_request(StubRequest()).build())
+        PluginLoader(middlewares=TEST_MIDDLEWARES).load_all_plugins(application)
+    mean_ms = (time.perf_counter() - start) * 1000 / runs
+    assert mean_ms < _limit('load_plugins_ms'), f"load_all_plugins: {mean_ms:.2f} ms"
@@ -0,0 +1,106 @@
+"""
+Broadcast engine: which send errors unsubscribe a chat and which stop the run.
+"""
+import concurrent.futures
+import pytest
+from conftest import BOT_ID, message_update
+from broadcast import Broadcaster
+from storage import storage
+
+CHATS = (501, 502, 503)
+
+@pytest.fixture
+def broadcaster(bot):
+    with storage.conn:
+        storage.conn.execute("DELETE FROM chats WHERE bot_id = ?", (BOT_ID,))
+    storage._known_chats.clear()
+    for chat_id in CHATS:
+        storage.remember_chat(chat_id, 'private', BOT_ID)
+    instance = Broadcaster(storage, rate=1000, concurrency=2, chunk_size=2)
+
+    async def attach():
+        instance.attach(bot.application)
+    bot.run(attach())
+    return instance
+
+def _broadcast(bot, broadcaster, text: str) -> dict:
+    async def run():
+        await broadcaster.start(text)
+        await broadcaster._task
+        return broadcaster.get_progress()
+    return bot.run(run())
+
+def test_broadcast_reaches_every_chat(bot, broadcaster):
+    progress = _broadcast(bot, broadcaster, "aviso")
+    assert progress['status'] == 'done' and progress['sent'] == len(CHATS)
+
+def test_missing_chats_are_deactivated(bot, broadcaster):
+    bot.request.fail_methods.add('sendMessage')
+    progress = _broadcast(bot, broadcaster, "aviso")
+    assert progress['status'] == 'done' and progress['failed'] == len(CHATS)
+    assert storage.count_chats(bot_id=BOT_ID) == 0
+
+def test_rejected_message_stops_the_broadcast(bot, broadcaster):
+    bot.request.fail_methods.add('sendMessage')
+    bot.request.fail_description = 'Bad Request: can\'t parse entities'
+    progress = _broadcast(bot, broadcaster, "aviso")
+    assert progress['status'] == 'failed'
+    # Only the first chunk was tried, and nobody was unsubscribed
+    assert [name for name, _ in bot.request.calls].count('sendMessage') <= broadcaster.concurrency
+    assert storage.count_chats(bot_id=BOT_ID) == len(CHATS)
+
+def test_overlong_message_is_refused(bot, broadcaster):
+    with pytest.raises(ValueError):
+        _broadcast(bot, broadcaster, "x" * 5000)
+    assert storage.get_unfinished_broadcast(BOT_ID) is None
+
+class _StuckFuture:
+    """A cross-thread future whose event loop never answers."""
+    def result(self, timeout=None):
+        raise concurrent.futures.TimeoutError()
+
+    def cancel(self):
+        return True
+
+@pytest.fixture
+def api(monkeypatch):
+    from config import config
+    import web_server
+    monkeypatch.setattr(config, 'BROADCAST_API_KEY', 'secret')
+    client = web_server.create_web_app().test_client()
+    return lambda payload: client.post('/api/broadcast', json=payload, headers={'X-API-Key': 'secret'})
+
+@pytest.mark.parametrize('headers', [{}, {'X-API-Key': 'wrong'}, {'X-API-Key': 'secreto'}, {'X-API-Key': 'sécret'}])
+def test_api_rejects_a_wrong_key(monkeypatch, headers):
+    from config import config
+    import web_server
+    monkeypatch.setattr(config, 'BROADCAST_API_KEY', 'secret')
+    client = web_server.create_web_app().test_client()
+    assert client.post('/api/broadcast', json={'text': 'hola'}, headers=headers).status_code == 403
+
+@pytest.mark.parametrize('payload', [{}, {'text': 42}, {'text': ['hola']}, {'text': '   '}, ['hola']])
+def test_api_rejects_invalid_text(api, payload):
+    assert api(payload).status_code == 400
+
+def test_api_reports_a_stuck_bot(api, monkeypatch):
+    import asyncio
+    import broadcast
+    monkeypatch.setattr(broadcast.broadcaster, 'loop', object())
+    monkeypatch.setattr(asyncio, 'run_coroutine_threadsafe', lambda coroutine, loop: coroutine.close() or _StuckFuture())
+    assert api({'text': 'hola'}).status_code == 504
+
+@pytest.mark.parametrize('command, sent', [
+    ('/broadcast estado', False),
+    ('/broadcast Estado del servicio: todo en orden', True),
+    ('/broadcast cancel the meeting, please', True),
+])
+def test_only_a_lone_keyword_is_a_subcommand(bot, broadcaster, monkeypatch, command, sent):
+    from config import config
+    import plugins.broadcast_plugin as broadcast_plugin
+    monkeypatch.setattr(config, 'ADMIN_IDS', {42})
+    monkeypatch.setattr(broadcast_plugin, 'get_broadcaster', lambda bot_id=None: broadcaster)
+    bot.process(message_update(command))
+    if broadcaster.is_running:
+        bot.run(broadcaster._task)
+    texts = [params['text'] for name, params in bot.request.calls if name == 'sendMessage']
+    assert (command.split(maxsplit=1)[1] in texts) == sent
@@ -0,0 +1,67 @@
+"""
+TTLCache: per-entry expiry, LRU eviction and hit statistics.
+"""
+from cache import TTLCache
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set('a', 1)
+    clock.now = 4.9
+    assert cache.get('a') == 1
+    clock.now = 5.0
+    assert cache.get('a') is None
+    # Dropped on read
+    assert len(cache) == 0
+
+def test_setting_again_renews_the_ttl():
+    clock = Clock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set('a', 1)
+    clock.now = 4
+    cache.set('a', 2)
+    clock.now = 8
+    assert cache.get('a') == 2
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=3, ttl=60, clock=Clock())
+    for key in 'abc':
+        cache.set(key, key)
+    # Reading 'a' makes 'b' the least recently used
+    assert cache.get('a') == 'a'
+    cache.set('d', 'd')
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert len(cache) == 3
+
+def test_updating_an_entry_does_not_evict():
+    cache = TTLCache(max_size=2, ttl=60, clock=Clock())
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('a', 3)
+    assert len(cache) == 2 and cache.get('a') == 3 and cache.get('b') == 2
+
+def test_falsy_values_and_defaults():
+    cache = TTLCache(max_size=2, ttl=60, clock=Clock())
+    cache.set('empty', [])
+    assert cache.get('empty', 'missing') == []
+    assert cache.get('other', 'missing') == 'missing'
+
+def test_stats_count_hits_and_misses():
+    clock = Clock()
+    cache = TTLCache(max_size=2, ttl=5, clock=clock)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+    clock.now = 10
+    cache.get('a')
+    assert cache.get_stats() == {'size': 0, 'hits': 1, 'misses': 2, 'hit_ratio': 0.333}
+    cache.clear()
+    assert len(cache) == 0
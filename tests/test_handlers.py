@@ -0,0 +1,195 @@
+"""
+Runs every registered plugin handler against fake updates.
+Each scenario checks the handler's output and records its time and peak
+allocations, reported at the end of the run (see conftest.HANDLER_REPORT).
+"""
+import io
+import json
+import struct
+import httpx
+import pytest
+from conftest import HANDLER_REPORT, callback_update, inline_update, message_update
+
+# A PNG header is enough for format and size detection
+PNG_640x480 = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR' + struct.pack('>II', 640, 480) + b'\x00' * 64
+
+PHOTO = [{'file_id': 'photo-file', 'file_unique_id': 'photo-unique', 'width': 640, 'height': 480,
+          'file_size': len(PNG_640x480)}]
+
+def _sent_text(calls: list, method: str = 'sendMessage') -> str:
+    texts = [params.get('text') for name, params in calls if name == method]
+    assert texts, f"no {method} in {[name for name, _ in calls]}"
+    return texts[-1]
+
+# scenario id -> (handler name, update, expected API method, expected text fragment)
+SCENARIOS = {
+    'start': ('start_command', message_update('/start'), 'sendMessage', 'Bienvenido al Bot, Ana'),
+    'start_en': ('start_command', message_update('/start', language_code='en'), 'sendMessage', 'Welcome to the Bot'),
+    'help': ('help_command', message_update('/help'), 'sendMessage', 'Comandos Disponibles'),
+    'help_en': ('help_command', message_update('/help', language_code='en-US'), 'sendMessage', 'Available Commands'),
+    'echo': ('echo_command', message_update('/echo hola mundo'), 'sendMessage', 'Repitiendo: hola mundo'),
+    'echo_usage': ('echo_command', message_update('/echo'), 'sendMessage', 'Usa: /echo'),
+    'echo_en': ('echo_command', message_update('/echo hello', language_code='en'), 'sendMessage', 'Echoing: hello'),
+    'broadcast_denied': ('broadcast_command', message_update('/broadcast hola'), 'sendMessage', 'solo para administradores'),
+    'recordar': ('recordar_command', message_update('/recordar 5 sacar la pizza'), 'sendMessage', 'en 5 minutos'),
+    'recordar_usage': ('recordar_command', message_update('/recordar pronto'), 'sendMessage', 'Usa: /recordar'),
+    'recordar_en': ('recordar_command', message_update('/recordar 1 stretch', language_code='en'), 'sendMessage',
+                    'in 1 minute'),
+    'message_greeting': ('handle_message', message_update('hola, ¿qué tal?'), 'sendMessage', '¡Hola Ana!'),
+    'message_question': ('handle_message', message_update('¿qué hora es?'), 'sendMessage', 'pregunta interesante'),
+    'message_en': ('handle_message', message_update('thanks!', language_code='en'), 'sendMessage', "You're very welcome"),
+    'media_photo': ('handle_media', message_update(photo=PHOTO), 'sendMessage', '640×480'),
+    'media_photo_en': ('handle_media', message_update(photo=PHOTO, language_code='en'), 'sendMessage', 'Dimensions'),
+    'inline': ('inline_query', inline_update('hola'), 'answerInlineQuery', None),
+    'help_button': ('callback_query', callback_update('help'), 'sendMessage', 'Comandos Disponibles'),
+}
+
+@pytest.fixture
+def media_files(bot):
+    """Serve PNG_640x480 for every file download."""
+    from media import media_processor
+    media_processor.results.clear()
+    media_processor._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=PNG_640x480)))
+    yield media_processor
+    bot.run(media_processor.shutdown())
+    media_processor.results.clear()
+
+def test_every_registered_handler_has_a_scenario(bot):
+    registered = {spec.name for spec in bot.loader.handler_specs}
+    covered = {handler for handler, _, _, _ in SCENARIOS.values()}
+    assert registered <= covered, f"handlers without a scenario: {registered - covered}"
+
+@pytest.mark.parametrize('scenario', list(SCENARIOS))
+def test_handler(bot, media_files, status_tracker, scenario):
+    handler, update, method, expected = SCENARIOS[scenario]
+    result = bot.measure(update)
+
+    output = _sent_text(result['calls'], method) if method != 'answerInlineQuery' else None
+    if expected:
+        assert expected in output
+    if method == 'answerInlineQuery':
+        assert any(name == 'answerInlineQuery' for name, _ in result['calls'])
+
+    # The timing middleware saw exactly this handler
+    assert status_tracker.get_handler_timings()[handler]['calls'] == 1
+    assert status_tracker.error_count == 0
+
+    HANDLER_REPORT[scenario] = {
+        'handler': handler,
+        'ms': round(result['ms'], 3),
+        'peak_kb': round(result['peak_kb'], 1),
+        'output': output
+    }
+
+def test_start_offers_help_button(bot):
+    calls = bot.process(message_update('/start'))
+    markup = calls[-1][1]['reply_markup']
+    assert 'callback_data' in str(markup) and 'help' in str(markup)
+
+def test_inline_results_are_cached_per_language(bot):
+    from plugins.inline_plugin import results_cache
+    results_cache.clear()
+    before = results_cache.get_stats()
+    bot.process(inline_update('hola', update_id=1))
+    bot.process(inline_update('hola', update_id=2, user_id=43))
+    bot.process(inline_update('hola', update_id=3, language_code='en'))
+    after = results_cache.get_stats()
+    assert after['hits'] - before['hits'] == 1
+    assert after['misses'] - before['misses'] == 2
+
+def test_broadcast_status_for_admin(bot, monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, 'ADMIN_IDS', {42})
+    text = _sent_text(bot.process(message_update('/broadcast estado')))
+    assert text.startswith('📣') and 'difusión' in text.lower()
+
+def test_reminder_is_scheduled_for_the_bot(bot):
+    from storage import storage
+    from scheduler import scheduler
+    bot.process(message_update('/recordar 10 llamar'))
+    rows = storage.conn.execute(
+        "SELECT id, bot_id, data FROM jobs WHERE callback LIKE '%send_reminder'").fetchall()
+    assert rows
+    job_id, bot_id, data = rows[-1]
+    assert bot_id == bot.application.bot.id and 'llamar' in data
+    scheduler.cancel(job_id)
+
+def test_handler_errors_are_counted_and_answered(bot, status_tracker):
+    bot.request.fail_methods.add('sendMessage')
+    calls = bot.process(message_update('/echo hola'))
+    # The handler's reply failed, then the error middleware's reply failed too
+    assert [name for name, _ in calls].count('sendMessage') == 2
+    assert calls[-1][1]['text'].startswith("Lo siento, no pude procesar el comando echo")
+    assert status_tracker.error_count == 1
+    assert status_tracker.bots['test_bot'].error_count == 1
+
+def test_error_reply_in_users_language(bot):
+    bot.request.fail_methods.add('sendMessage')
+    calls = bot.process(message_update('/echo hello', language_code='en'))
+    assert calls[-1][1]['text'] == "Sorry, I couldn't process the echo command. Please try again."
+
+def test_reminder_is_delivered_in_users_language(bot):
+    from plugins.reminder_plugin import send_reminder
+    from storage import storage
+    bot.process(message_update('/recordar 10 stretch', language_code='en'))
+    data = storage.conn.execute(
+        "SELECT data FROM jobs WHERE callback LIKE '%send_reminder' ORDER BY rowid DESC").fetchone()[0]
+    bot.run(send_reminder(bot.application.bot, json.loads(data)))
+    assert bot.request.calls[-1][1]['text'] == "⏰ Reminder: stretch"
+
+def test_chats_are_remembered_per_bot(bot):
+    from storage import storage
+    bot.process(message_update('hola', user_id=777))
+    assert storage.count_chats(bot_id=bot.application.bot.id) >= 1
+    assert storage.count_chats(bot_id=bot.application.bot.id + 1) == 0
+
+def test_document_previews_are_uploaded_per_bot(bot, media_files):
+    from conftest import BOT_ID, BotHarness
+    Image = pytest.importorskip('PIL.Image')
+    image = io.BytesIO()
+    Image.new('RGB', (64, 48), 'red').save(image, 'PNG')
+    media_files._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=image.getvalue())))
+    document = {'file_id': 'doc-file', 'file_unique_id': 'doc-unique', 'file_name': 'foto.png',
+                'file_size': len(image.getvalue())}
+
+    def preview(harness) -> object:
+        calls = harness.process(message_update(document=document))
+        uploads = [params.get('photo') for name, params in calls if name == 'sendPhoto']
+        assert uploads, "no preview sent"
+        # None: the preview bytes were uploaded; a string: a stored file_id was reused
+        return uploads[-1]
+
+    other = BotHarness(bot_id=BOT_ID + 1)
+    try:
+        # The second bot can't use the first bot's file_id: it uploads its own copy
+        assert preview(bot) is None
+        assert preview(other) is None
+        assert preview(bot) == f'thumb-{BOT_ID}'
+        assert preview(other) == f'thumb-{BOT_ID + 1}'
+    finally:
+        other.close()
+
+def test_unknown_media_format_is_localized(bot, media_files):
+    media_files._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b'\0' * 64)))
+    document = {'file_id': 'blob-file', 'file_unique_id': 'blob-unique', 'file_size': 64}
+    text = _sent_text(bot.process(message_update(document=document, language_code='en')))
+    assert 'Format: unknown' in text
+
+def test_broadcast_status_is_localized(bot):
+    from plugins.broadcast_plugin import _format_progress
+    progress = {'id': 3, 'bot': 'test_bot', 'status': 'done', 'sent': 2, 'failed': 0, 'total': 2,
+                'throughput': 1.0, 'eta_seconds': None}
+    assert 'Difusión #3: terminada' in _format_progress(progress, 'es')
+    assert 'Broadcast #3: done' in _format_progress(progress, 'en')
+
+def test_error_handler_replies_in_users_language(bot, status_tracker):
+    from types import SimpleNamespace
+    from telegram import Update
+    from plugins.error_plugin import error_handler
+    update = Update.de_json(message_update('hello', language_code='en'), bot.application.bot)
+    context = SimpleNamespace(error=RuntimeError('boom'), bot=bot.application.bot)
+    bot.run(error_handler(update, context))
+    assert bot.request.calls[-1][1]['text'] == "Sorry, something went wrong. Please try again later."
@@ -0,0 +1,129 @@
+"""
+MediaProcessor: in-flight deduplication, size limits while streaming,
+spooling big downloads to disk and cleaning up the temporary file.
+CPU work runs in a thread pool here; the worker functions are the same.
+"""
+import os
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import httpx
+import pytest
+import media
+from media import MediaProcessor, MediaTooLarge
+
+class FakeBot:
+    def __init__(self):
+        self.get_file_calls = 0
+
+    async def get_file(self, file_id):
+        self.get_file_calls += 1
+        return SimpleNamespace(file_path=f"https://files.test/{file_id}")
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    """Temporary files go to an empty directory we can inspect."""
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    """Record what the worker receives: (bytes or None, path or None, size on disk)."""
+    calls = []
+    original = media.media_worker.analyze
+
+    def analyze(data, path, thumbnail=False):
+        calls.append((data, path, os.path.getsize(path) if path else None))
+        return original(data, path, thumbnail)
+
+    monkeypatch.setattr(media.media_worker, 'analyze', analyze)
+    return calls
+
+def _processor(content: bytes, **options) -> MediaProcessor:
+    processor = MediaProcessor(**{'max_bytes': 4096, 'spool_bytes': 1024, 'chunk_bytes': 256, **options})
+    processor._pool = ThreadPoolExecutor(max_workers=2)
+    processor._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=content)))
+    return processor
+
+def _run(processor: MediaProcessor, scenario):
+    async def run():
+        try:
+            return await scenario()
+        finally:
+            await processor.shutdown()
+    return asyncio.run(run())
+
+def test_small_file_stays_in_memory(spool_dir, analyzed):
+    processor, bot = _processor(b'\x89PNG\r\n\x1a\n' + b'\0' * 100), FakeBot()
+    result = _run(processor, lambda: processor.process(bot, 'f', 'u'))
+    assert result['format'] == 'PNG' and result['size'] == 108
+    data, path, _ = analyzed[0]
+    assert data is not None and path is None
+    assert list(spool_dir.iterdir()) == []
+
+def test_big_file_spills_to_disk_and_is_deleted(spool_dir, analyzed):
+    processor, bot = _processor(b'%PDF' + b'x' * 3000), FakeBot()
+    result = _run(processor, lambda: processor.process(bot, 'f', 'u'))
+    assert result['format'] == 'PDF' and result['size'] == 3004
+    data, path, size_on_disk = analyzed[0]
+    assert data is None and size_on_disk == 3004
+    assert not os.path.exists(path)
+    assert list(spool_dir.iterdir()) == []
+
+def test_declared_size_over_limit_skips_the_download(analyzed):
+    processor, bot = _processor(b''), FakeBot()
+    with pytest.raises(MediaTooLarge):
+        _run(processor, lambda: processor.process(bot, 'f', 'u', file_size=10_000))
+    assert bot.get_file_calls == 0 and analyzed == []
+
+def test_stream_over_limit_is_aborted_and_cleaned_up(spool_dir, analyzed):
+    # Size unknown up front: the limit is enforced while streaming, after spilling to disk
+    processor, bot = _processor(b'x' * 10_000), FakeBot()
+    with pytest.raises(MediaTooLarge):
+        _run(processor, lambda: processor.process(bot, 'f', 'u'))
+    assert analyzed == []
+    assert list(spool_dir.iterdir()) == []
+
+def test_concurrent_requests_for_one_file_share_a_job(analyzed):
+    processor, bot = _processor(b'GIF89a' + b'\0' * 100), FakeBot()
+
+    async def scenario():
+        return await asyncio.gather(*(processor.process(bot, 'f', 'same') for _ in range(5)))
+
+    results = _run(processor, scenario)
+    assert bot.get_file_calls == 1 and len(analyzed) == 1
+    assert all(result == results[0] for result in results)
+    assert processor._inflight == {}
+
+def test_results_are_cached_by_unique_id(analyzed):
+    processor, bot = _processor(b'GIF89a' + b'\0' * 100), FakeBot()
+
+    async def scenario():
+        await processor.process(bot, 'first-id', 'same')
+        # Forwarded copy: new file_id, same file_unique_id
+        await processor.process(bot, 'second-id', 'same')
+
+    _run(processor, scenario)
+    assert bot.get_file_calls == 1 and len(analyzed) == 1
+
+def test_failed_jobs_are_not_cached(monkeypatch):
+    processor, bot = _processor(b'GIF89a'), FakeBot()
+    failures = [RuntimeError('worker crashed')]
+    original = media.media_worker.analyze
+
+    def analyze(data, path, thumbnail=False):
+        if failures:
+            raise failures.pop()
+        return original(data, path, thumbnail)
+
+    monkeypatch.setattr(media.media_worker, 'analyze', analyze)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await processor.process(bot, 'f', 'u')
+        return await processor.process(bot, 'f', 'u')
+
+    assert _run(processor, scenario)['format'] == 'GIF'
+    assert bot.get_file_calls == 2
@@ -0,0 +1,74 @@
+"""
+Tests for plugin discovery and handler registration.
+"""
+import pytest
+from telegram.ext import CallbackQueryHandler, CommandHandler, InlineQueryHandler, MessageHandler
+from middleware import build_chain, HandlerSpec
+from plugin_loader import PluginLoader
+
+EXPECTED_COMMANDS = {'start', 'help', 'echo', 'broadcast', 'recordar'}
+
+EXPECTED_HANDLERS = {
+    'start_command', 'help_command', 'echo_command', 'broadcast_command', 'recordar_command',
+    'handle_message', 'handle_media', 'inline_query', 'callback_query'
+}
+
+def _handlers(application) -> list:
+    return [handler for group in application.handlers.values() for handler in group]
+
+def test_loads_every_plugin(bot):
+    plugins = bot.loader.get_loaded_plugins()
+    assert set(plugins) == {
+        'start_plugin', 'help_plugin', 'echo_plugin', 'broadcast_plugin', 'reminder_plugin',
+        'message_plugin', 'media_plugin', 'inline_plugin', 'stats_plugin', 'error_plugin'
+    }
+
+def test_registers_commands(bot):
+    commands = set()
+    for handler in _handlers(bot.application):
+        if isinstance(handler, CommandHandler):
+            commands |= handler.commands
+    assert commands == EXPECTED_COMMANDS
+
+def test_registers_handler_kinds(bot):
+    handlers = _handlers(bot.application)
+    kinds = {type(handler) for handler in handlers}
+    assert {CommandHandler, MessageHandler, InlineQueryHandler, CallbackQueryHandler} <= kinds
+    # Media and inline handlers must not hold up other updates
+    for handler in handlers:
+        if isinstance(handler, InlineQueryHandler):
+            assert handler.block is False
+    assert bot.application.error_handlers
+
+def test_every_handler_goes_through_the_middleware_chain(bot):
+    specs = {spec.name: spec for spec in bot.loader.handler_specs}
+    assert set(specs) == EXPECTED_HANDLERS
+    assert specs['handle_message'].kind == 'message'
+    assert specs['handle_media'].kind == 'media'
+    assert specs['inline_query'].kind == 'inline'
+    assert specs['callback_query'].kind == 'callback'
+    assert specs['echo_command'].command == 'echo'
+    # Plugin error replies are picked up at registration
+    assert specs['echo_command'].error_reply == 'error.echo'
+
+def test_reloading_into_a_second_application_registers_the_same_handlers(bot):
+    from conftest import BotHarness
+    second = BotHarness()
+    try:
+        assert len(_handlers(second.application)) == len(_handlers(bot.application))
+        assert {spec.name for spec in second.loader.handler_specs} == EXPECTED_HANDLERS
+    finally:
+        second.close()
+
+def test_unknown_middleware_is_rejected():
+    async def handler(update, context):
+        return None
+    with pytest.raises(ValueError):
+        build_chain(handler, HandlerSpec(name='handler'), ['errors', 'nope'])
+
+def test_missing_plugins_directory_registers_nothing(bot):
+    loader = PluginLoader(plugins_dir='no_such_dir', middlewares=[])
+    before = len(_handlers(bot.application))
+    loader.load_all_plugins(bot.application)
+    assert len(_handlers(bot.application)) == before
+    assert loader.get_loaded_plugins() == {}
@@ -0,0 +1,78 @@
+"""
+Tests for free-text replies and the localized catalogs behind them.
+"""
+import os
+import json
+import string
+import pytest
+from i18n import LOCALES_DIR, Catalog, catalog
+from plugins.message_plugin import _process_message
+
+@pytest.mark.parametrize('message, expected', [
+    ('Hola!', '¡Hola Ana!'),
+    ('buenas noches', '¡Hola Ana!'),
+    ('¿Qué hora es?', 'pregunta interesante'),
+    ('muchas gracias', '¡De nada!'),
+    ('nos vemos', '¡Adiós Ana!'),
+    ('necesito ayuda', 'Estoy aquí para ayudar'),
+    ('esto es genial', 'Es maravilloso'),
+])
+def test_spanish_intents(message, expected):
+    assert expected in _process_message(message, 'Ana', 'es')
+
+@pytest.mark.parametrize('message, expected', [
+    ('hello there', 'Hello Bob!'),
+    ('what time is it?', 'interesting question, Bob'),
+    ('thanks a lot', "You're very welcome"),
+    ('see you later', 'Goodbye Bob!'),
+    ('can you assist me', "I'm here to help"),
+    ('that was awesome', 'wonderful to hear, Bob'),
+])
+def test_english_intents(message, expected):
+    assert expected in _process_message(message, 'Bob', 'en')
+
+def test_intents_are_checked_in_catalog_order():
+    # A greeting wins over a question, a question over thanks
+    assert _process_message('hola, ¿cómo estás?', 'Ana', 'es').startswith('¡Hola')
+    assert 'pregunta' in _process_message('¿me ayudas, gracias?', 'Ana', 'es')
+
+def test_other_messages_get_a_stable_default_reply():
+    reply = _process_message('el cielo está nublado', 'Ana', 'es')
+    assert 'Ana' in reply
+    assert reply == _process_message('el cielo está nublado', 'Ana', 'es')
+
+def test_default_language():
+    assert _process_message('hola', 'Ana') == _process_message('hola', 'Ana', catalog.default_language)
+
+@pytest.mark.parametrize('code, language', [
+    ('es', 'es'), ('es-419', 'es'), ('en', 'en'), ('en-US', 'en'), ('EN_gb', 'en'), ('pt-br', 'es'), (None, 'es'),
+])
+def test_language_resolution(code, language):
+    assert catalog.language(code) == language
+
+def _placeholders(source) -> set:
+    variants = source if isinstance(source, list) else [source]
+    return {field for variant in variants for _, field, _, _ in string.Formatter().parse(variant) if field}
+
+def test_every_language_has_every_message():
+    sources = {}
+    for language in catalog.languages:
+        with open(os.path.join(LOCALES_DIR, f"{language}.json"), encoding='utf-8') as f:
+            sources[language] = json.load(f)['messages']
+    default = sources[catalog.default_language]
+    for language, messages in sources.items():
+        assert set(messages) == set(default), f"{language}: {set(messages) ^ set(default)}"
+        for key, source in messages.items():
+            assert _placeholders(source) == _placeholders(default[key]), f"{language}: {key}"
+
+def test_missing_messages_fall_back_to_the_default_language():
+    compiled = Catalog({
+        'es': {'messages': {'hello': 'Hola {name}', 'bye': 'Adiós'}},
+        'en': {'messages': {'hello': 'Hi {name}'}},
+    }, default_language='es')
+    assert compiled.text('hello', 'en', name='Bob') == 'Hi Bob'
+    assert compiled.text('bye', 'en') == 'Adiós'
+
+def test_unknown_default_language_is_rejected():
+    with pytest.raises(ValueError):
+        Catalog({'en': {'messages': {}}}, default_language='es')
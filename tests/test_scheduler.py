@@ -0,0 +1,200 @@
+"""
+Scheduler: coalescing, leases between workers, periodic rescheduling,
+cancelling, and jobs bound to one of several hosted bots.
+Workers share one store and a fake clock, and are driven one timer tick at a time.
+"""
+import time
+import asyncio
+from types import SimpleNamespace
+import pytest
+from scheduler import PeriodicJob, Scheduler
+from storage import Storage
+
+RUNS = []
+
+async def record_run(bot, data):
+    RUNS.append((bot.id, data))
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    RUNS.clear()
+    return Clock()
+
+@pytest.fixture
+def store():
+    store = Storage(':memory:')
+    yield store
+    store.close()
+
+def _worker(store: Storage, clock: Clock, *bot_ids: int, name: str = None) -> Scheduler:
+    bot_ids = bot_ids or (1,)
+    worker = Scheduler(store, lease=300, poll_interval=30, worker_id=name or f"worker-{bot_ids}", clock=clock)
+    worker.application = SimpleNamespace(bot=SimpleNamespace(id=bot_ids[0]))
+    for bot_id in bot_ids:
+        worker.add_bot(SimpleNamespace(id=bot_id))
+    return worker
+
+async def _tick(*workers: Scheduler, sync: bool = False):
+    """One timer wakeup on each worker, then wait for the jobs it started."""
+    for worker in workers:
+        if sync:
+            worker._sync(worker.clock())
+        worker._dispatch_due(worker.clock())
+    for worker in workers:
+        await worker.stop()
+
+def test_one_off_job_runs_once_and_is_removed(store, clock):
+    async def scenario():
+        worker = _worker(store, clock)
+        job_id = worker.schedule(record_run, 60, {'text': 'hola'})
+        clock.now += 59
+        await _tick(worker)
+        assert RUNS == []
+        clock.now += 1
+        await _tick(worker)
+        assert RUNS == [(1, {'text': 'hola'})]
+        assert store.get_job(job_id) is None
+    asyncio.run(scenario())
+
+def test_periodic_job_is_rescheduled(store, clock):
+    async def scenario():
+        worker = _worker(store, clock)
+        start = clock.now
+        worker.add_periodic(PeriodicJob('tick', record_run, interval=60))
+        for _ in range(3):
+            clock.now += 60
+            await _tick(worker)
+        assert len(RUNS) == 3
+        assert store.get_job('tick')['next_run'] == start + 4 * 60
+        assert worker._scheduled['tick'] == start + 4 * 60
+    asyncio.run(scenario())
+
+def test_missed_periodic_runs_are_coalesced(store, clock):
+    async def scenario():
+        worker = _worker(store, clock)
+        start = clock.now
+        worker.add_periodic(PeriodicJob('tick', record_run, interval=60))
+        # Down for a bit over five intervals
+        clock.now += 5 * 60 + 10
+        await _tick(worker)
+        assert len(RUNS) == 1
+        # Back on the regular grid, not 60 s after the late run
+        assert store.get_job('tick')['next_run'] == start + 6 * 60
+    asyncio.run(scenario())
+
+def test_periodic_schedule_survives_a_restart(store, clock):
+    async def scenario():
+        worker = _worker(store, clock)
+        worker.add_periodic(PeriodicJob('tick', record_run, interval=60))
+        first_run = store.get_job('tick')['next_run']
+        clock.now += 30
+        # Declared again by the restarted process: keeps the persisted next run
+        _worker(store, clock).add_periodic(PeriodicJob('tick', record_run, interval=60))
+        assert store.get_job('tick')['next_run'] == first_run
+    asyncio.run(scenario())
+
+def test_cancelled_job_never_runs(store, clock):
+    async def scenario():
+        worker = _worker(store, clock)
+        job_id = worker.schedule(record_run, 10, {})
+        assert worker.cancel(job_id)
+        assert not worker.cancel(job_id)
+        clock.now += 20
+        await _tick(worker, sync=True)
+        assert RUNS == [] and worker.pending_count == 0
+    asyncio.run(scenario())
+
+def test_two_workers_never_run_a_job_twice(store, clock):
+    async def scenario():
+        first, second = _worker(store, clock, name='first'), _worker(store, clock, name='second')
+        job_id = first.schedule(record_run, 10, {'n': 1})
+        second._sync(clock())
+        assert job_id in second._scheduled
+        clock.now += 10
+        # Both timers fire at once; only the first claim wins
+        first._dispatch_due(clock())
+        second._dispatch_due(clock())
+        await _tick(first, second)
+        assert RUNS == [(1, {'n': 1})]
+    asyncio.run(scenario())
+
+def test_periodic_job_is_split_between_workers(store, clock):
+    async def scenario():
+        first, second = _worker(store, clock, name='first'), _worker(store, clock, name='second')
+        first.add_periodic(PeriodicJob('tick', record_run, interval=60))
+        second.add_periodic(PeriodicJob('tick', record_run, interval=60))
+        for _ in range(4):
+            clock.now += 60
+            await _tick(first, second, sync=True)
+        assert len(RUNS) == 4
+    asyncio.run(scenario())
+
+def test_expired_lease_lets_another_worker_run_the_job(store, clock):
+    async def scenario():
+        survivor = _worker(store, clock, name='survivor')
+        job_id = survivor.schedule(record_run, 10, {})
+        clock.now += 10
+        # A worker claims the job and dies before running it
+        job = store.get_job(job_id)
+        assert store.claim_job(job_id, job['next_run'], 'dead', clock() + 300, clock())
+        await _tick(survivor)
+        assert RUNS == []
+        # It retries once the lease is over
+        clock.now += 301
+        await _tick(survivor, sync=True)
+        assert len(RUNS) == 1
+    asyncio.run(scenario())
+
+def test_jobs_for_other_bots_are_left_in_place(store, clock):
+    async def scenario():
+        first, second = _worker(store, clock, 1), _worker(store, clock, 2)
+        job_id = first.schedule(record_run, 0, {'text': 'hola'}, bot_id=2)
+        await _tick(first, sync=True)
+        job = store.get_job(job_id)
+        assert RUNS == [] and job is not None and job['lease_until'] is None
+        # Not picked up again by the worker that can't run it
+        first._sync(clock())
+        assert job_id not in first._scheduled
+
+        await _tick(second, sync=True)
+        assert RUNS == [(2, {'text': 'hola'})]
+        assert store.get_job(job_id) is None
+    asyncio.run(scenario())
+
+def _tick_cost(pending: int) -> float:
+    """Mean seconds per timer wakeup with ``pending`` jobs waiting in the future."""
+    store = Storage(':memory:')
+    clock = Clock()
+    worker = _worker(store, clock)
+    for index in range(pending):
+        worker.schedule(record_run, 3600 + index, {})
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        worker._dispatch_due(clock())
+    elapsed = (time.perf_counter() - start) / runs
+    store.close()
+    return elapsed
+
+def test_timer_overhead_is_flat_in_pending_jobs():
+    small, large = _tick_cost(10), _tick_cost(20000)
+    # A wakeup only looks at the top of the heap: 2000x the jobs, same cost
+    assert large < small * 5 + 2e-6, f"{small * 1e6:.2f} µs vs {large * 1e6:.2f} µs"
+
+def test_one_timer_for_any_number_of_jobs(store, clock):
+    async def scenario():
+        worker = _worker(store, clock)
+        for index in range(5000):
+            worker.schedule(record_run, 3600 + index, {})
+        before = len(asyncio.all_tasks())
+        worker.start(SimpleNamespace(bot=SimpleNamespace(id=1)))
+        assert len(asyncio.all_tasks()) == before + 1
+        await worker.stop()
+    asyncio.run(scenario())
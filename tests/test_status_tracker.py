@@ -0,0 +1,79 @@
+"""
+Tests for the dashboard's BotStatusTracker.
+"""
+import pytest
+import web_server
+from web_server import BotStatusTracker, RollingRate
+
+@pytest.fixture
+def tracker(monkeypatch):
+    # get_stats samples CPU for a second; not needed here
+    monkeypatch.setattr(web_server.psutil, 'cpu_percent', lambda interval=None: 0.0)
+    return BotStatusTracker()
+
+def test_counts_and_unique_users(tracker):
+    tracker.log_message(1)
+    tracker.log_message(1)
+    tracker.log_command(2)
+    tracker.log_error()
+    tracker.log_dropped()
+    stats = tracker.get_stats()
+    assert (stats['message_count'], stats['command_count'], stats['error_count'], stats['dropped_count']) == (2, 1, 1, 1)
+    assert stats['active_users'] == 2
+
+def test_per_bot_counters(tracker):
+    tracker.register_bot('idle_bot')
+    tracker.log_message(1, 'bot_a')
+    tracker.log_command(2, 'bot_a')
+    tracker.log_message(1, 'bot_b')
+    tracker.log_error('bot_b')
+    bots = tracker.get_stats()['bots']
+    assert bots['bot_a'] == {'message_count': 1, 'command_count': 1, 'error_count': 0,
+                             'dropped_count': 0, 'active_users': 2}
+    assert bots['bot_b']['error_count'] == 1
+    assert bots['idle_bot']['message_count'] == 0
+    # Totals cover every bot
+    assert tracker.message_count == 2 and len(tracker.active_users) == 2
+
+def test_handler_timings(tracker):
+    tracker.log_handler_time('echo_command', 0.002)
+    tracker.log_handler_time('echo_command', 0.004)
+    timing = tracker.get_handler_timings()['echo_command']
+    assert timing == {'calls': 2, 'avg_ms': 3.0, 'max_ms': 4.0}
+
+def test_uptime_when_stopped(tracker):
+    assert tracker.get_uptime() == "Bot no está ejecutándose"
+    tracker.bot_started()
+    assert tracker.get_uptime().endswith('s')
+    assert tracker.get_stats()['is_running'] is True
+
+def test_rolling_rate_windows():
+    now = [1000.0]
+    rate = RollingRate(clock=lambda: now[0])
+    now[0] = 1100.0
+    for _ in range(30):
+        rate.add()
+    now[0] = 1100.5
+    snapshot = rate.snapshot()
+    # 59 full one-second buckets plus half of the current one
+    assert snapshot['rate_1m'] == pytest.approx(30 / 59.5, abs=1e-3)
+    assert snapshot['peak_1s'] == 30
+    # Events older than the window no longer count
+    now[0] += 120
+    assert rate.snapshot()['rate_1m'] == 0
+
+def test_broadcast_progress_per_bot(tracker):
+    tracker.update_broadcast({'id': 1, 'bot': 'bot_a', 'status': 'running', 'sent': 5, 'failed': 0,
+                              'total': 10, 'throughput': 2.0, 'eta_seconds': 3})
+    tracker.update_broadcast({'id': 2, 'bot': 'bot_b', 'status': 'done', 'sent': 4, 'failed': 1,
+                              'total': 5, 'throughput': 1.0, 'eta_seconds': None})
+    broadcasts = tracker.get_stats()['broadcasts']
+    assert broadcasts['bot_a']['status'] == 'running' and broadcasts['bot_b']['status'] == 'done'
+
+def test_dashboard_renders_broadcasts(status_tracker, monkeypatch):
+    monkeypatch.setattr(web_server.psutil, 'cpu_percent', lambda interval=None: 0.0)
+    status_tracker.update_broadcast({'id': 7, 'bot': 'bot_a', 'status': 'running', 'sent': 5, 'failed': 0,
+                                     'total': 10, 'throughput': 2.0, 'eta_seconds': 3})
+    client = web_server.create_web_app().test_client()
+    assert '@bot_a · #7' in client.get('/').get_data(as_text=True)
+    assert client.get('/api/broadcast?bot=bot_a').get_json()['id'] == 7
@@ -0,0 +1,40 @@
+"""
+Throttler: token buckets per user, chat, command and hosted bot.
+"""
+from throttle import Quota, Throttler
+
+def _throttler(now: list) -> Throttler:
+    return Throttler(Quota(2, 0.1), Quota(5, 0.1), {'echo': Quota(1, 0.1)}, clock=lambda: now[0])
+
+def test_user_quota_refills():
+    now = [0.0]
+    throttler = _throttler(now)
+    assert throttler.allow(42, 42) and throttler.allow(42, 42)
+    assert not throttler.allow(42, 42)
+    now[0] += 10
+    assert throttler.allow(42, 42)
+
+def test_command_quota():
+    throttler = _throttler([0.0])
+    assert throttler.allow(42, 42, 'echo')
+    assert not throttler.allow(42, 42, 'echo')
+    assert throttler.allow(42, 42, 'start')
+
+def test_bots_have_separate_buckets():
+    throttler = _throttler([0.0])
+    assert throttler.allow(42, 42, bot_id=1) and throttler.allow(42, 42, bot_id=1)
+    assert not throttler.allow(42, 42, bot_id=1)
+    # Flooding bot 1 doesn't throttle the same user on bot 2
+    assert throttler.allow(42, 42, bot_id=2)
+
+def test_dropped_button_press_is_answered(monkeypatch):
+    from conftest import BotHarness, callback_update
+    from throttle import throttler
+    monkeypatch.setattr(throttler, 'allow', lambda *args: False)
+    harness = BotHarness(middlewares=['throttle'])
+    try:
+        calls = harness.process(callback_update('help'))
+    finally:
+        harness.close()
+    # Nothing is sent, but the spinner on the button is stopped
+    assert [name for name, _ in calls] == ['answerCallbackQuery']
@@ -0,0 +1,97 @@
+"""
+Inbound throttling for the Telegram bot.
+Token buckets per user, per chat and per command, used by the throttle middleware.
+"""
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from config import config
+
+class Quota(NamedTuple):
+    """Token bucket size and refill speed (tokens per second)."""
+    capacity: float
+    refill_rate: float
+
+def parse_quota(spec: str) -> Quota:
+    """Parse a quota written as ``"<count>/<seconds>"``, e.g. ``"20/60"``."""
+    count, _, seconds = spec.strip().partition('/')
+    count = float(count)
+    seconds = float(seconds or 1)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid quota: {spec!r}")
+    return Quota(count, count / seconds)
+
+def parse_command_quotas(spec: str) -> dict:
+    """Parse per-command quotas written as ``"echo=5/30,start=3/60"``."""
+    quotas = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        command, _, quota = item.partition('=')
+        quotas[command.strip().lstrip('/').lower()] = parse_quota(quota)
+    return quotas
+
+class Throttler:
+    """Token bucket rate limiter keyed by user, chat and command.
+
+    Buckets are per hosted bot, so flooding one bot doesn't throttle the
+    same user on another.
+
+    Buckets live in an LRU-ordered dict capped at ``max_keys`` entries, so
+    memory stays bounded no matter how many users show up. A bucket that
+    gets evicted simply starts full again next time.
+    """
+
+    def __init__(self, user_quota: Quota, chat_quota: Quota, command_quotas: dict,
+                 max_keys: int = 10000, clock=time.monotonic):
+        self.user_quota = user_quota
+        self.chat_quota = chat_quota
+        self.command_quotas = command_quotas
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+
+    @classmethod
+    def from_config(cls, cfg) -> "Throttler":
+        """Build a throttler from the global configuration."""
+        return cls(
+            parse_quota(cfg.THROTTLE_USER_RATE),
+            parse_quota(cfg.THROTTLE_CHAT_RATE),
+            parse_command_quotas(cfg.THROTTLE_COMMAND_RATES),
+            max_keys=cfg.THROTTLE_MAX_KEYS
+        )
+
+    def _refill(self, key, quota: Quota, now: float) -> list:
+        """Get the bucket for ``key`` with tokens refilled up to ``now``."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = [quota.capacity, now]
+            return bucket
+        self._buckets.move_to_end(key)
+        bucket[0] = min(quota.capacity, bucket[0] + (now - bucket[1]) * quota.refill_rate)
+        bucket[1] = now
+        return bucket
+
+    def allow(self, user_id: Optional[int], chat_id: Optional[int], command: Optional[str] = None,
+              bot_id: int = 0) -> bool:
+        """Take one token from every matching bucket, or none if any is empty."""
+        now = self.clock()
+        buckets = []
+        if user_id is not None:
+            buckets.append(self._refill(('user', bot_id, user_id), self.user_quota, now))
+            quota = self.command_quotas.get(command) if command else None
+            if quota:
+                buckets.append(self._refill(('command', bot_id, user_id, command), quota, now))
+        if chat_id is not None and chat_id != user_id:
+            buckets.append(self._refill(('chat', bot_id, chat_id), self.chat_quota, now))
+
+        if any(bucket[0] < 1 for bucket in buckets):
+            return False
+        for bucket in buckets:
+            bucket[0] -= 1
+        return True
+
+# Global throttler instance
+throttler = Throttler.from_config(config)
@@ -3,25 +3,156 @@ Web server for Telegram bot status dashboard.
 Shows bot uptime, statistics, and system information.
 """
 import os
+import hmac
+import time
 import logging
+import concurrent.futures
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 import psutil
 import asyncio
 from threading import Thread
 
 logger = logging.getLogger(__name__)
 
+class RateRing:
+    """Fixed-size ring of time buckets counting events per bucket.
+    
+    Each slot remembers which bucket epoch it holds, so stale slots are
+    recycled lazily on write and skipped on read - no background sweeping.
+    """
+    
+    __slots__ = ('resolution', 'size', 'counts', 'epochs', 'peak')
+    
+    def __init__(self, resolution: int, size: int):
+        self.resolution = resolution
+        self.size = size
+        self.counts = [0] * size
+        self.epochs = [-1] * size
+        self.peak = 0
+    
+    def add(self, now: float, amount: int = 1):
+        """Count events in the bucket containing ``now`` (O(1))."""
+        epoch = int(now // self.resolution)
+        index = epoch % self.size
+        if self.epochs[index] != epoch:
+            self.epochs[index] = epoch
+            self.counts[index] = amount
+        else:
+            self.counts[index] += amount
+        if self.counts[index] > self.peak:
+            self.peak = self.counts[index]
+    
+    def total(self, now: float) -> int:
+        """Sum of events inside the window ending at ``now`` (O(buckets))."""
+        oldest = int(now // self.resolution) - self.size + 1
+        return sum(count for count, epoch in zip(self.counts, self.epochs) if epoch >= oldest)
+    
+    def window_peak(self, now: float) -> int:
+        """Busiest single bucket inside the window ending at ``now``."""
+        oldest = int(now // self.resolution) - self.size + 1
+        return max((count for count, epoch in zip(self.counts, self.epochs) if epoch >= oldest), default=0)
+    
+    def span(self, now: float) -> float:
+        """Seconds covered by the window, including the partial current bucket."""
+        return (self.size - 1) * self.resolution + (now % self.resolution)
+
+
+class RollingRate:
+    """Sliding-window event rate at 1 s, 1 min and 1 h resolution.
+    
+    Memory is constant: 60 one-second buckets (last minute), 60 one-minute
+    buckets (last hour) and 24 one-hour buckets (last day).
+    """
+    
+    WINDOWS = (('1m', 1, 60), ('1h', 60, 60), ('24h', 3600, 24))
+    
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.created = clock()
+        self.rings = [RateRing(resolution, size) for _, resolution, size in self.WINDOWS]
+    
+    def add(self, amount: int = 1):
+        """Record ``amount`` events happening now."""
+        now = self.clock()
+        for ring in self.rings:
+            ring.add(now, amount)
+    
+    def snapshot(self) -> dict:
+        """Per-second rates for every window plus peak bucket counts."""
+        now = self.clock()
+        alive = max(now - self.created, 1.0)
+        result = {}
+        for (name, _, _), ring in zip(self.WINDOWS, self.rings):
+            span = min(ring.span(now), alive)
+            result[f'rate_{name}'] = round(ring.total(now) / max(span, 1.0), 3)
+        one_second, one_minute, one_hour = self.rings
+        result['peak_1s'] = one_second.peak
+        result['peak_1m'] = one_minute.peak
+        result['peak_1h'] = one_hour.peak
+        result['peak_1s_last_minute'] = one_second.window_peak(now)
+        return result
+
+
+class BotCounters:
+    """Message, command, error and drop counts of one hosted bot."""
+    __slots__ = ('message_count', 'command_count', 'error_count', 'dropped_count', 'active_users')
+    
+    def __init__(self):
+        self.message_count = 0
+        self.command_count = 0
+        self.error_count = 0
+        self.dropped_count = 0
+        self.active_users = set()
+    
+    def to_dict(self):
+        return {
+            'message_count': self.message_count,
+            'command_count': self.command_count,
+            'error_count': self.error_count,
+            'dropped_count': self.dropped_count,
+            'active_users': len(self.active_users)
+        }
+
+
 class BotStatusTracker:
-    """Tracks bot statistics and status information."""
+    """Tracks bot statistics and status information.
+    
+    Totals cover every hosted bot; the ``bot`` argument of the log methods
+    (the bot's username) also adds the event to that bot's own counters.
+    """
     
     def __init__(self):
         self.start_time = datetime.now()
         self.message_count = 0
         self.command_count = 0
         self.error_count = 0
+        self.dropped_count = 0
         self.active_users = set()
         self.is_bot_running = False
+        # Progress of each bot's current or last broadcast (username -> progress),
+        # pushed by the broadcasters
+        self.broadcasts = {}
+        # Per-handler timings: name -> [calls, total seconds, max seconds]
+        self.handler_timings = {}
+        # Sliding-window rates; only the bot's event loop writes to them
+        self.message_rate = RollingRate()
+        self.command_rate = RollingRate()
+        self.error_rate = RollingRate()
+        self.dropped_rate = RollingRate()
+        # Per-bot counters: username -> BotCounters
+        self.bots = {}
+    
+    def register_bot(self, bot: str):
+        """List a hosted bot on the dashboard, even before its first update."""
+        if bot not in self.bots:
+            self.bots[bot] = BotCounters()
+    
+    def _counters(self, bot: str) -> BotCounters:
+        counters = self.bots.get(bot)
+        if counters is None:
+            counters = self.bots[bot] = BotCounters()
+        return counters
     
     def bot_started(self):
         """Mark bot as started."""
@@ -34,19 +165,64 @@ class BotStatusTracker:
         self.is_bot_running = False
         logger.info("Bot status tracker: Bot stopped")
     
-    def log_message(self, user_id: int):
+    def log_message(self, user_id: int, bot: str = None):
         """Log a message received."""
         self.message_count += 1
+        self.message_rate.add()
         self.active_users.add(user_id)
+        if bot:
+            counters = self._counters(bot)
+            counters.message_count += 1
+            counters.active_users.add(user_id)
     
-    def log_command(self, user_id: int):
+    def log_command(self, user_id: int, bot: str = None):
         """Log a command received."""
         self.command_count += 1
+        self.command_rate.add()
         self.active_users.add(user_id)
+        if bot:
+            counters = self._counters(bot)
+            counters.command_count += 1
+            counters.active_users.add(user_id)
     
-    def log_error(self):
+    def log_error(self, bot: str = None):
         """Log an error."""
         self.error_count += 1
+        self.error_rate.add()
+        if bot:
+            self._counters(bot).error_count += 1
+    
+    def log_dropped(self, bot: str = None):
+        """Log an update dropped by throttling."""
+        self.dropped_count += 1
+        self.dropped_rate.add()
+        if bot:
+            self._counters(bot).dropped_count += 1
+    
+    def update_broadcast(self, progress: dict):
+        """Store the latest broadcast progress of the bot it belongs to."""
+        self.broadcasts[progress['bot']] = progress
+    
+    def log_handler_time(self, name: str, seconds: float):
+        """Log how long a handler took to run."""
+        timing = self.handler_timings.get(name)
+        if timing is None:
+            timing = self.handler_timings[name] = [0, 0.0, 0.0]
+        timing[0] += 1
+        timing[1] += seconds
+        if seconds > timing[2]:
+            timing[2] = seconds
+    
+    def get_handler_timings(self):
+        """Get call count, average and max time (ms) per handler."""
+        return {
+            name: {
+                'calls': calls,
+                'avg_ms': round(total * 1000 / calls, 3) if calls else 0.0,
+                'max_ms': round(peak * 1000, 3)
+            }
+            for name, (calls, total, peak) in self.handler_timings.items()
+        }
     
     def get_uptime(self):
         """Get bot uptime as a formatted string."""
@@ -67,6 +243,15 @@ class BotStatusTracker:
         else:
             return f"{seconds}s"
     
+    def get_rates(self):
+        """Get sliding-window rates (events per second) and peaks."""
+        return {
+            'messages': self.message_rate.snapshot(),
+            'commands': self.command_rate.snapshot(),
+            'errors': self.error_rate.snapshot(),
+            'dropped': self.dropped_rate.snapshot()
+        }
+    
     def get_stats(self):
         """Get all statistics as a dictionary."""
         return {
@@ -76,7 +261,12 @@ class BotStatusTracker:
             'message_count': self.message_count,
             'command_count': self.command_count,
             'error_count': self.error_count,
+            'dropped_count': self.dropped_count,
             'active_users': len(self.active_users),
+            'rates': self.get_rates(),
+            'bots': {bot: counters.to_dict() for bot, counters in self.bots.items()},
+            'handlers': self.get_handler_timings(),
+            'broadcasts': self.broadcasts,
             'system': {
                 'cpu_percent': psutil.cpu_percent(interval=1),
                 'memory_percent': psutil.virtual_memory().percent,
@@ -103,6 +293,53 @@ def create_web_app():
         """API endpoint for bot statistics."""
         return jsonify(status_tracker.get_stats())
     
+    @app.route('/api/middleware')
+    def api_middleware():
+        """API endpoint for middleware self time (needs MIDDLEWARE_PROFILE)."""
+        from middleware import get_profile
+        return jsonify(get_profile())
+    
+    @app.route('/api/broadcast', methods=['GET', 'POST'])
+    def api_broadcast():
+        """Get broadcast progress per bot (?bot=username for one), or start one
+        with POST {"text": ..., "bot": optional id or username}."""
+        if request.method == 'GET':
+            bot = request.args.get('bot', '').lstrip('@')
+            return jsonify(status_tracker.broadcasts.get(bot) if bot else status_tracker.broadcasts)
+        
+        from config import config
+        api_key = request.headers.get('X-API-Key', '').encode()
+        if not config.BROADCAST_API_KEY or not hmac.compare_digest(api_key, config.BROADCAST_API_KEY.encode()):
+            return jsonify({'error': 'unauthorized'}), 403
+        
+        from broadcast import broadcaster, broadcasters
+        payload = request.get_json(silent=True) or {}
+        text = payload.get('text') if isinstance(payload, dict) else None
+        if not isinstance(text, str) or not text.strip():
+            return jsonify({'error': 'text is required'}), 400
+        text = text.strip()
+        bot = str(payload.get('bot') or '').lstrip('@')
+        if bot:
+            # Pick one of the hosted bots by id or username
+            broadcaster = next((candidate for candidate in broadcasters.values()
+                                if bot in (str(candidate.bot_id), candidate.application.bot.username)), None)
+            if broadcaster is None:
+                return jsonify({'error': f'unknown bot: {bot}'}), 404
+        if broadcaster.loop is None:
+            return jsonify({'error': 'bot is not running'}), 503
+        
+        # The broadcast runs on the bot's event loop, not on this Flask thread
+        future = asyncio.run_coroutine_threadsafe(broadcaster.start(text), broadcaster.loop)
+        try:
+            return jsonify(future.result(timeout=10)), 202
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return jsonify({'error': 'the bot did not answer in time'}), 504
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except RuntimeError as e:
+            return jsonify({'error': str(e)}), 409
+    
     @app.route('/api/health')
     def health_check():
         """Health check endpoint."""